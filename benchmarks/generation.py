@@ -0,0 +1,38 @@
+"""
+Maze generation time: fast flat-array DFS vs the original per-cell DFS.
+
+    python -m benchmarks.generation --sizes 1000 4000 10000 --legacy-max 4000
+"""
+import argparse
+import time
+
+from maze.maze_generator import MazeGenerator
+
+
+def time_generation(size, algorithm, seed):
+    mg = MazeGenerator(size, size, algorithm=algorithm, seed=seed)
+    t0 = time.perf_counter()
+    mg.generate_maze()
+    return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 4000, 10000])
+    parser.add_argument("--legacy-max", type=int, default=4000,
+                        help="skip the legacy generator above this size")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'size':>7} {'dfs (s)':>10} {'legacy (s)':>11} {'speedup':>8}")
+    for size in args.sizes:
+        fast = time_generation(size, "dfs", args.seed)
+        if size <= args.legacy_max:
+            legacy = time_generation(size, "dfs_legacy", args.seed)
+            print(f"{size:>7} {fast:>10.2f} {legacy:>11.2f} {legacy / fast:>7.1f}x")
+        else:
+            print(f"{size:>7} {fast:>10.2f} {'skipped':>11} {'-':>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+HPA* vs plain A*: preprocessing time, memory, per-query latency, and the
+latency of updating the map after a wall edit vs rebuilding it.
+
+    python -m benchmarks.hierarchical --size 1001 --cluster 16 --queries 50 --edits 50
+"""
+import argparse
+import random
+import statistics
+import time
+import tracemalloc
+
+from maze.algorithms import astar
+from maze.hierarchical import HierarchicalMap, hierarchical_map
+from maze.maze_generator import MazeGenerator
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=501)
+    parser.add_argument("--cluster", type=int, default=16)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--edits", type=int, default=20, help="random wall toggles to time")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    mg = MazeGenerator(args.size, args.size, seed=args.seed)
+    mg.generate_maze()
+    mg.neighbor_mask()
+
+    t0 = time.perf_counter()
+    hmap = HierarchicalMap(mg, args.cluster)
+    build_time = time.perf_counter() - t0
+
+    # Second build under tracemalloc so tracing does not skew the timing
+    tracemalloc.start()
+    HierarchicalMap(mg, args.cluster)
+    _, build_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    nodes = sum(len(edges) for edges in hmap.intra.values())
+    print(f"maze {mg.height}x{mg.width}, cluster {args.cluster}: "
+          f"{nodes} abstract nodes, build {build_time * 1000:.1f} ms, "
+          f"peak {build_peak / 2**20:.1f} MiB")
+
+    open_cells = [(r, c) for r in range(1, mg.height, 2) for c in range(1, mg.width, 2)]
+    hpa_times, astar_times, ratios = [], [], []
+    for _ in range(args.queries):
+        mg.start, mg.goal = rng.sample(open_cells, 2)
+
+        t0 = time.perf_counter()
+        _, hpa_cost, _ = hmap.search()
+        hpa_times.append(time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        _, astar_cost, _ = astar(mg)
+        astar_times.append(time.perf_counter() - t0)
+
+        ratios.append(hpa_cost / astar_cost)
+
+    for name, times in (("HPA*", hpa_times), ("A*", astar_times)):
+        print(f"{name:5s} median {statistics.median(times) * 1000:8.2f} ms   "
+              f"max {max(times) * 1000:8.2f} ms")
+    print(f"path cost HPA*/A*: mean {statistics.mean(ratios):.3f}, max {max(ratios):.3f}")
+
+    # Sửa tường qua set_wall(): hierarchical_map() chỉ dựng lại các cụm quanh ô
+    hierarchical_map(mg, args.cluster)  # dựng map trong cache trước khi sửa
+    update_times = []
+    for _ in range(args.edits):
+        r, c = rng.randrange(1, mg.height - 1), rng.randrange(1, mg.width - 1)
+        if (r, c) in (mg.start, mg.goal):
+            continue
+        mg.set_wall(r, c, mg.maze[r, c] == 0)
+        t0 = time.perf_counter()
+        hierarchical_map(mg, args.cluster)
+        update_times.append(time.perf_counter() - t0)
+
+    if update_times:
+        t0 = time.perf_counter()
+        HierarchicalMap(mg, args.cluster)
+        rebuild = time.perf_counter() - t0
+        print(f"edit  update median {statistics.median(update_times) * 1000:8.2f} ms   "
+              f"max {max(update_times) * 1000:8.2f} ms   (full rebuild {rebuild * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Maze storage memory, measured with tracemalloc: the old int64 grid vs the
+uint8 grid, plus the peak while generating and building the neighbor mask.
+
+    python -m benchmarks.memory --sizes 1000 2000 4000
+"""
+import argparse
+import tracemalloc
+
+import numpy as np
+
+from maze.maze_generator import MazeGenerator, WALL_DTYPE
+
+MIB = 2 ** 20
+
+
+def traced_peak(fn):
+    tracemalloc.start()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 2000, 4000])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'size':>7} {'int64 grid':>11} {'uint8 grid':>11} {'mask peak':>10} {'gen peak':>9}  (MiB)")
+    for size in args.sizes:
+        old_grid, _ = traced_peak(lambda: np.ones((size, size), dtype=int))
+        new_grid, _ = traced_peak(lambda: np.ones((size, size), dtype=WALL_DTYPE))
+
+        mg = MazeGenerator(size, size, seed=args.seed)
+        gen_peak, _ = traced_peak(mg.generate_maze)
+        mg.invalidate_neighbors()
+        mask, _ = traced_peak(mg.neighbor_mask)
+
+        print(f"{size:>7} {old_grid / MIB:>11.1f} {new_grid / MIB:>11.1f} "
+              f"{mask / MIB:>10.1f} {gen_peak / MIB:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Worker startup time and memory: pickling the maze vs attaching shared memory.
+
+    python -m benchmarks.shared_memory --size 4001 --workers 4
+
+Each of --workers tasks receives the maze (pickled MazeGenerator, or the
+SharedMaze descriptor and attach()), reads every grid and mask page, and
+reports its RSS split into private and shared pages (Linux /proc). The
+wall time covers pickling/transfer or publish + attach. --solve also runs
+dijkstra in each task, after the RSS sample.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from maze.algorithms import dijkstra
+from maze.maze_generator import MazeGenerator
+from maze.shared import SharedMaze, attach
+
+
+def rss_mib():
+    """(private, shared) resident MiB of this process"""
+    fields = {}
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in ("RssAnon", "RssFile", "RssShmem"):
+                    fields[key] = int(value.split()[0]) / 1024
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 0.0
+    return fields.get("RssAnon", 0.0), fields.get("RssShmem", 0.0)
+
+
+def baseline(_):
+    time.sleep(0.05)
+    return os.getpid(), rss_mib()
+
+
+def use_maze(mg, solve):
+    # Chạm mọi trang của lưới và mask để RSS phản ánh toàn bộ dữ liệu
+    walls = int(mg.maze.sum()) + int(mg.neighbor_mask().sum())
+    rss = rss_mib()
+    cost = None
+    if solve:
+        path, cost, explored = dijkstra(mg)
+    return os.getpid(), walls, cost, rss
+
+
+def task_pickled(args):
+    mg, solve = args
+    return use_maze(mg, solve)
+
+
+def task_shared(args):
+    descriptor, solve = args
+    return use_maze(attach(descriptor), solve)
+
+
+def run(pool, fn, arg, workers, base):
+    t0 = time.perf_counter()
+    results = list(pool.map(fn, [arg] * workers))
+    wall = time.perf_counter() - t0
+
+    private = [r[3][0] - base.get(r[0], (0, 0))[0] for r in results]
+    shared = [r[3][1] for r in results]
+    return wall, results, sum(private) / len(private), sum(shared) / len(shared)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=2001)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start-method", default="spawn", choices=["spawn", "forkserver", "fork"])
+    parser.add_argument("--solve", action="store_true", help="also run dijkstra in every task")
+    args = parser.parse_args()
+
+    mg = MazeGenerator(args.size, args.size, seed=args.seed)
+    mg.generate_maze()
+    mg.neighbor_mask()
+    mib = 2 * mg.maze.nbytes / 2 ** 20
+    print(f"maze {mg.height}x{mg.width}: grid + neighbor mask = {mib:.1f} MiB")
+
+    ctx = get_context(args.start_method)
+    for label in ("pickle", "shared"):
+        # Pool mới cho mỗi cách để RSS không lẫn nhau; khởi động worker trước khi đo
+        with ProcessPoolExecutor(max_workers=args.workers, mp_context=ctx) as pool:
+            base = dict(pool.map(baseline, range(args.workers * 2)))
+            if label == "pickle":
+                wall, results, private, shared = run(pool, task_pickled, (mg, args.solve),
+                                                     args.workers, base)
+            else:
+                t0 = time.perf_counter()
+                with SharedMaze.publish(mg) as published:
+                    publish = time.perf_counter() - t0
+                    wall, results, private, shared = run(pool, task_shared,
+                                                         (published.descriptor, args.solve),
+                                                         args.workers, base)
+                wall += publish
+
+        checks = {(r[1], r[2]) for r in results}
+        print(f"{label:6s}: {wall * 1000:8.1f} ms for {args.workers} tasks  "
+              f"private +{private:7.1f} MiB  shared {shared:7.1f} MiB per worker  "
+              f"(walls, cost) {checks}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Headless benchmark suite for maze generators and solvers (no pygame).
+
+    python -m benchmarks.suite --sizes 101 301 --seeds 0 1 --algorithms dijkstra astar jps \
+        --warmup 1 --repeat 5 --csv results.csv --json results.json
+
+For each size x seed one maze is generated; every algorithm is run
+--warmup times untimed (this also builds cached preprocessing such as the
+junction graph or HPA* clusters), then --repeat times timed, then once
+more under tracemalloc for peak memory. Costs are checked against bfs(),
+and the instrumented solver loops against their plain versions.
+"""
+import argparse
+import csv
+import json
+import math
+import platform
+import statistics
+import time
+import tracemalloc
+
+import numpy as np
+
+from maze.algorithms import check_stats_variants
+from maze.maze_generator import GENERATORS, GENERATOR_VERSION, MazeGenerator
+from maze.solvers import SOLVERS
+
+FIELDS = [
+    "generator", "size", "seed", "algorithm", "repeat",
+    "median_ms", "p95_ms", "expanded", "nodes_per_sec", "peak_mib",
+    "cost", "reference_cost", "cost_ok", "path_len",
+]
+
+
+def percentile(values, q):
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def bench_solver(mg, solver, warmup, repeat):
+    for _ in range(warmup):
+        solver(mg)
+
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        path, cost, explored = solver(mg)
+        times.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    solver(mg)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return times, peak, path, cost, len(explored)
+
+
+def run(args):
+    results = []
+    for size in args.sizes:
+        for seed in args.seeds:
+            mg = MazeGenerator(size, size, algorithm=args.generator, seed=seed)
+            t0 = time.perf_counter()
+            mg.generate_maze()
+            gen_time = time.perf_counter() - t0
+            _, reference, _ = SOLVERS["bfs"](mg)
+            check_stats_variants(mg)
+            print(f"# {args.generator} {mg.height}x{mg.width} seed={seed}: "
+                  f"generated in {gen_time * 1000:.1f} ms, shortest path {reference}")
+
+            for name in args.algorithms:
+                times, peak, path, cost, expanded = bench_solver(
+                    mg, SOLVERS[name], args.warmup, args.repeat)
+                median = statistics.median(times)
+                row = {
+                    "generator": args.generator,
+                    "size": size,
+                    "seed": seed,
+                    "algorithm": name,
+                    "repeat": args.repeat,
+                    "median_ms": round(median * 1000, 3),
+                    "p95_ms": round(percentile(times, 95) * 1000, 3),
+                    "expanded": expanded,
+                    "nodes_per_sec": round(expanded / median) if median > 0 else 0,
+                    "peak_mib": round(peak / 2 ** 20, 3),
+                    "cost": cost,
+                    "reference_cost": reference,
+                    "cost_ok": cost == reference,
+                    "path_len": len(path) if path else 0,
+                }
+                results.append(row)
+                print(f"  {name:20s} median {row['median_ms']:9.2f} ms  p95 {row['p95_ms']:9.2f} ms  "
+                      f"{row['expanded']:8d} nodes  {row['nodes_per_sec']:10d} nodes/s  "
+                      f"peak {row['peak_mib']:7.2f} MiB  cost {'ok' if row['cost_ok'] else cost}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[51, 101, 201])
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0, 1, 2])
+    parser.add_argument("--algorithms", nargs="+", default=list(SOLVERS), choices=list(SOLVERS))
+    parser.add_argument("--generator", default="dfs", choices=GENERATORS)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--csv", help="write one row per (size, seed, algorithm)")
+    parser.add_argument("--json", help="write results plus run metadata")
+    args = parser.parse_args()
+
+    results = run(args)
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(results)
+
+    if args.json:
+        meta = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "generator_version": GENERATOR_VERSION,
+            "args": vars(args),
+        }
+        with open(args.json, "w") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+
+    if not all(row["cost_ok"] for row in results):
+        print("WARNING: some algorithms disagree with the bfs() path cost")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,66 @@
 import math
+import numpy as np
 import pygame
 import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
 from maze.maze_generator import MazeGenerator
-from maze.algorithms import dijkstra, astar
+from maze.shared import SharedMaze
+from maze.solvers import prepared_planner, prepared_planner_shared, timed_solve, timed_solve_shared
+from maze.algorithms import (
+    dijkstra, astar, bidirectional_bfs, bidirectional_astar, BACKWARD,
+)
+
+# =============================
+# Font + cache chữ đã render
+# =============================
+FONT_NAME = "segoeui"
+_FONTS = {}
+
+
+def get_font(size, bold=False):
+    """SysFont loaded once per (size, bold) and shared by every draw call"""
+    key = (size, bold)
+    font = _FONTS.get(key)
+    if font is None:
+        font = _FONTS[key] = pygame.font.SysFont(FONT_NAME, size, bold=bold)
+    return font
+
+
+class TextCache:
+    """
+    LRU of rendered text surfaces keyed by (font, text, colour). Labels and
+    stats that do not change between frames become a dict lookup + blit.
+    """
+
+    def __init__(self, capacity=512):
+        self.capacity = capacity
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, color, size, bold=False):
+        key = ((size, bold), text, color)
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+        surf = self.surfaces[key] = get_font(size, bold).render(text, True, color)
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)
+        return surf
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+TEXT_CACHE = TextCache()
+
 
 # =============================
 # Soft Neon Button (Đậm)
@@ -11,7 +69,6 @@ class SoftButton:
     def __init__(self, x, y, w, h, text):
         self.rect = pygame.Rect(x, y, w, h)
         self.text = text
-        self.font = pygame.font.SysFont("segoeui", 22)
 
         self.bg = (28, 28, 44)
         self.hover_bg = (58, 48, 85)
@@ -32,7 +89,7 @@ class SoftButton:
             pygame.draw.rect(glow, (122, 92, 255, 45), glow.get_rect(), border_radius=12)
             screen.blit(glow, (self.rect.x - 8, self.rect.y - 8))
 
-        txt = self.font.render(self.text, True, self.text_color)
+        txt = TEXT_CACHE.render(self.text, self.text_color, 22)
         screen.blit(txt, (
             self.rect.centerx - txt.get_width() // 2,
             self.rect.centery - txt.get_height() // 2,
@@ -48,14 +105,13 @@ class SoftButton:
 class DropdownButton:
     def __init__(self, x, y, w, h):
         self.main_rect = pygame.Rect(x, y, w, h)
-        self.font = pygame.font.SysFont("segoeui", 22)
 
         self.bg = (28, 28, 44)
         self.hover_bg = (58, 48, 85)
         self.border = (122, 92, 255)
         self.text_color = (235, 235, 255)
 
-        self.options = ["Dijkstra", "A*", "Compare"]
+        self.options = ["Dijkstra", "A*", "Compare", "Bidirectional"]
         self.current = "Compare"
         self.open = False
 
@@ -72,7 +128,7 @@ class DropdownButton:
         pygame.draw.rect(screen, color, self.main_rect, border_radius=10)
         pygame.draw.rect(screen, self.border, self.main_rect, 2, border_radius=10)
 
-        txt = self.font.render("Mode: " + self.current, True, self.text_color)
+        txt = TEXT_CACHE.render("Mode: " + self.current, self.text_color, 22)
         screen.blit(txt, (
             self.main_rect.centerx - txt.get_width() // 2,
             self.main_rect.centery - txt.get_height() // 2,
@@ -83,7 +139,7 @@ class DropdownButton:
                 pygame.draw.rect(screen, self.bg, opt_rect, border_radius=8)
                 pygame.draw.rect(screen, self.border, opt_rect, 2, border_radius=8)
 
-                txt2 = self.font.render(self.options[i], True, self.text_color)
+                txt2 = TEXT_CACHE.render(self.options[i], self.text_color, 22)
                 screen.blit(txt2, (
                     opt_rect.centerx - txt2.get_width() // 2,
                     opt_rect.centery - txt2.get_height() // 2,
@@ -120,6 +176,10 @@ BG_COLOR = (0, 0, 10)
 DIJ_RADAR_COLOR = (120, 220, 255)   # xanh ngọc sáng dịu
 AST_RADAR_COLOR = (255, 170, 230)   # tím hồng pastel
 
+# Sóng quét phía goal của chế độ Bidirectional
+DIJ_RADAR_BACK_COLOR = (255, 190, 120)   # cam nhạt
+AST_RADAR_BACK_COLOR = (200, 170, 255)   # tím lavender
+
 DIJ_PATH_COLOR  = (255, 230, 120)   # vàng kem, nổi bật
 AST_PATH_COLOR  = (120, 255, 170)   # xanh mint cho A*
 
@@ -131,6 +191,8 @@ PAC_WALL_BORDER       = (90, 105, 150)   # viền nhẹ, không chói
 PAC_PATH_BG           = BG_COLOR         # giữ nền hiện tại
 PAC_PELLET_COLOR      = (200, 200, 220)  # hạt xám sáng nhẹ
 PAC_ROBOT_COLOR       = (255, 215, 120)  # vàng kem thay vì vàng neon
+START_COLOR           = (255, 230, 90)   # ô start vàng (điểm spawn Pacman)
+GOAL_COLOR            = (130, 255, 130)  # ô goal xanh lá (cổng/fruit)
 
 
 
@@ -140,18 +202,26 @@ PAUSED = False
 
 CELL_SIZE = 20  # auto override later
 
+MAZE_ALGORITHM = "dfs"  # "dfs" | "kruskal" | "dfs_legacy"
+SOLVER_STATS = False    # đo heap/stale/peak open... (chạy thêm bản đo) và hiện trên thẻ HUD
+RASTER_CELL_SIZE = 3    # ô nhỏ hơn số px này: vẽ cả khung bằng numpy + surfarray
+SHARED_MAZE_CELLS = 250_000  # từ cỡ này gửi maze cho worker qua shared memory thay vì pickle
+STALE_JOB_GRACE = 0.25       # job cũ chạy lâu hơn (s) thì thay pool thay vì chờ nó xong
+
 
 # =============================
 # Drawing
 # =============================
 
-def draw_maze(surface, maze, start, goal, ox, oy):
+def draw_maze(surface, maze, start, goal, ox, oy, view=None):
+    """view = (r0, r1, c0, c1): chỉ vẽ các ô trong khung nhìn của camera"""
     rows, cols = maze.shape
     sr, sc = start
     gr, gc = goal
+    r0, r1, c0, c1 = view or (0, rows, 0, cols)
 
-    for r in range(rows):
-        for c in range(cols):
+    for r in range(r0, r1):
+        for c in range(c0, c1):
             x = ox + c * CELL_SIZE
             y = oy + r * CELL_SIZE
 
@@ -175,22 +245,112 @@ def draw_maze(surface, maze, start, goal, ox, oy):
     # Start – ô màu vàng (giống điểm spawn Pacman)
     sx = ox + sc * CELL_SIZE
     sy = oy + sr * CELL_SIZE
-    pygame.draw.rect(surface, (255, 230, 90), (sx, sy, CELL_SIZE, CELL_SIZE))
+    pygame.draw.rect(surface, START_COLOR, (sx, sy, CELL_SIZE, CELL_SIZE))
     pygame.draw.rect(surface, PAC_WALL_BORDER, (sx, sy, CELL_SIZE, CELL_SIZE), 2)
 
     # Goal – ô màu xanh lá (giống cổng/fruit)
     gx = ox + gc * CELL_SIZE
     gy = oy + gr * CELL_SIZE
-    pygame.draw.rect(surface, (130, 255, 130), (gx, gy, CELL_SIZE, CELL_SIZE))
+    pygame.draw.rect(surface, GOAL_COLOR, (gx, gy, CELL_SIZE, CELL_SIZE))
     pygame.draw.rect(surface, PAC_WALL_BORDER, (gx, gy, CELL_SIZE, CELL_SIZE), 2)
 
 
-
-def draw_robot(surface, path, idx, ox, oy, color=None):
+class TileCache:
+    """
+    Lớp vẽ chia thành các tile cố định theo toạ độ ô của maze (mỗi tile
+    khoảng TILE_PX px vuông). Khi pan, kéo hay follow chỉ các tile mới lộ
+    ra mới phải vẽ; tile đã vẽ được giữ cho tới khi lớp con xoá chúng.
+    Lớp con cài _build_tile(); builds đếm số tile đã vẽ (overlay F3).
+    """
+    TILE_PX = 256
+    MAX_TILES = 48  # quá số này thì bỏ các tile ngoài khung nhìn
+
+    def __init__(self):
+        self.tiles = {}  # (tr, tc) -> Surface
+        self.builds = 0
+
+    def tile_cells(self):
+        """Số ô mỗi cạnh tile ở CELL_SIZE hiện tại"""
+        return max(1, self.TILE_PX // CELL_SIZE)
+
+    def tiles_of(self, cells, margin=0):
+        """Các tile chứa các ô (r, c) trong cells, nới thêm margin ô mỗi phía"""
+        t = self.tile_cells()
+        return {((r + dr) // t, (c + dc) // t)
+                for r, c in cells
+                for dr in range(-margin, margin + 1) for dc in range(-margin, margin + 1)}
+
+    def blit_tiles(self, surface, ox, oy, view, shape):
+        """Blit các tile phủ view (vẽ tile còn thiếu) lên surface, gốc maze ở (ox, oy)"""
+        r0, r1, c0, c1 = view
+        if r1 <= r0 or c1 <= c0:
+            return
+        rows, cols = shape
+        t = self.tile_cells()
+        visible = [(tr, tc) for tr in range(r0 // t, (r1 - 1) // t + 1)
+                   for tc in range(c0 // t, (c1 - 1) // t + 1)]
+        for tr, tc in visible:
+            tile = self.tiles.get((tr, tc))
+            if tile is None:
+                cells = (tr * t, min(rows, tr * t + t), tc * t, min(cols, tc * t + t))
+                tile = self.tiles[tr, tc] = self._build_tile(cells)
+                self.builds += 1
+            surface.blit(tile, (ox + tc * t * CELL_SIZE, oy + tr * t * CELL_SIZE))
+        if len(self.tiles) > self.MAX_TILES:
+            self.tiles = {key: self.tiles[key] for key in visible}
+
+    def _build_tile(self, cells):
+        raise NotImplementedError
+
+
+class MazeLayer(TileCache):
+    """
+    Lớp tĩnh (tường, hạt, start, goal) vẽ bằng draw_maze() theo tile; mỗi
+    frame chỉ blit. Maze mới, CELL_SIZE hay start/goal đổi thì vẽ lại từ
+    đầu; sửa tường (mg.edits_since) chỉ vẽ lại các tile quanh ô bị sửa.
+    """
+    def __init__(self):
+        super().__init__()
+        self.mg = None
+        self.key = None
+
+    def draw(self, surface, mg, ox, oy, view=None):
+        rows, cols = mg.maze.shape
+        view = view or (0, rows, 0, cols)
+        key = (mg.revision, CELL_SIZE, mg.start, mg.goal)
+        if mg is not self.mg or self.key is None or key[1:] != self.key[1:]:
+            self.tiles = {}
+        elif key[0] != self.key[0]:
+            edits = mg.edits_since(self.key[0])
+            if edits is None:
+                self.tiles = {}
+            else:
+                # Hạt của ô bên cạnh có thể tràn sang ô bị sửa: nới 1 ô
+                for tile in self.tiles_of(edits, margin=1):
+                    self.tiles.pop(tile, None)
+        self.mg, self.key = mg, key
+        self.blit_tiles(surface, ox, oy, view, (rows, cols))
+
+    def _build_tile(self, cells):
+        mg = self.mg
+        rows, cols = mg.maze.shape
+        r0, r1, c0, c1 = cells
+        tile = pygame.Surface(((c1 - c0) * CELL_SIZE, (r1 - r0) * CELL_SIZE)).convert()
+        tile.fill(BG_COLOR)
+        # Vẽ cả 1 ô viền (bị cắt theo tile) để phần hạt tràn qua mép tile
+        # giống hệt khi vẽ cả maze một lần
+        draw_maze(tile, mg.maze, mg.start, mg.goal, -c0 * CELL_SIZE, -r0 * CELL_SIZE,
+                  (max(0, r0 - 1), min(rows, r1 + 1), max(0, c0 - 1), min(cols, c1 + 1)))
+        return tile
+
+
+def draw_robot(surface, path, idx, ox, oy, color=None, view=None):
     if idx >= len(path):
         return
 
     r, c = path[idx]
+    if view and not (view[0] <= r < view[1] and view[2] <= c < view[3]):
+        return
     cx = ox + c * CELL_SIZE + CELL_SIZE // 2
     cy = oy + r * CELL_SIZE + CELL_SIZE // 2
     radius = CELL_SIZE // 2 - 2
@@ -216,35 +376,128 @@ def draw_robot(surface, path, idx, ox, oy, color=None):
     pygame.draw.polygon(surface, BG_COLOR, [(x1, y1), (x2, y2), (x3, y3)])
 
 
-def draw_radar(surface, explored, ox, oy, base_color, upto):
+def radar_cell(entry, base_color, back_color):
+    """Ô (r, c) hoặc (r, c, side) của thuật toán hai chiều -> (r, c, màu)"""
+    if len(entry) == 3 and entry[2] == BACKWARD and back_color is not None:
+        return entry[0], entry[1], back_color
+    return entry[0], entry[1], base_color
+
+
+class RadarOverlay(TileCache):
     """
-    Hiển thị rõ:
-    - Tất cả ô đã quét: nền màu nhạt
-    - Ô đang quét: viền đậm + chấm tròn sáng
+    Lớp phủ radar của một khung, giữ qua các frame. Mỗi frame chỉ tô thêm
+    các ô mới quét (explored[painted:upto]) vào các tile đã có rồi blit, nên
+    chi phí theo số ô mới chứ không theo tổng số ô đã quét.
+    reset() khi đổi mode, Replay, Reload; explored mới, upto lùi lại hoặc
+    đổi CELL_SIZE cũng tự vẽ lại từ đầu.
+    Tile mới lộ ra khi pan được tô từ lưới order (thứ tự quét của từng ô).
+    Ô bị quét nhiều lần (hai phía của Bidirectional) được trộn các lớp alpha
+    theo đúng thứ tự quét, như khi blit chồng từng ô bán trong suốt.
     """
-    n = min(upto, len(explored))
-    if n <= 0:
-        return
-
-    # 1) Tô overlay nhạt cho TẤT CẢ ô đã quét
-    for i in range(n):
-        r, c = explored[i]
-        x = ox + c * CELL_SIZE
-        y = oy + r * CELL_SIZE
+    ALPHA = 55  # alpha nhỏ cho dịu mắt
+
+    def __init__(self, base_color, back_color=None):
+        super().__init__()
+        self.base_color = base_color
+        self.back_color = back_color
+        self.explored = None
+        self.order = None   # order[r, c] = lần quét đầu tiên của ô, -1 = chưa quét
+        self.repeats = {}   # (r, c) -> các lần quét sau lần đầu, tăng dần
+        self.cell_size = None
+        self.painted = 0
+
+    def reset(self):
+        self.explored = None
+
+    def _build_order(self, explored, shape):
+        self.order = np.full(shape, -1, dtype=np.int32)
+        self.repeats = {}
+        if explored:
+            cells = np.asarray(explored)
+            # np.unique trả về lần xuất hiện đầu tiên của mỗi ô (id phẳng),
+            # không dựa vào thứ tự ghi khi gán fancy index có phần tử trùng
+            ids, first = np.unique(cells[:, 0] * shape[1] + cells[:, 1], return_index=True)
+            self.order.reshape(-1)[ids] = first
+            later = np.ones(len(cells), dtype=bool)
+            later[first] = False
+            for i in np.nonzero(later)[0].tolist():
+                self.repeats.setdefault((int(cells[i, 0]), int(cells[i, 1])), []).append(i)
+
+    def _cell_rgba(self, explored, r, c, upto):
+        """Màu RGBA của ô sau khi chồng mọi lần quét có chỉ số < upto"""
+        a = self.ALPHA / 255
+        rgb, alpha = (0.0, 0.0, 0.0), 0.0
+        for i in [self.order[r, c], *self.repeats.get((r, c), ())]:
+            if i >= upto:
+                break
+            color = radar_cell(explored[i], self.base_color, self.back_color)[2]
+            # Phép "over" với alpha thẳng: lớp mới a phủ lên lớp cũ alpha
+            out = a + alpha * (1 - a)
+            rgb = tuple((a * x + alpha * (1 - a) * y) / out for x, y in zip(color, rgb))
+            alpha = out
+        return (*(round(x) for x in rgb), round(alpha * 255))
+
+    def draw(self, surface, explored, ox, oy, upto, shape, view=None):
+        n = min(upto, len(explored))
+        rows, cols = shape
+        view = view or (0, rows, 0, cols)
+
+        if explored is not self.explored:
+            self._build_order(explored, shape)
+            self.explored = explored
+            self.cell_size = None
+        if CELL_SIZE != self.cell_size or n < self.painted:
+            # Tile vẽ sau đều được tô tới self.painted từ lưới order
+            self.tiles = {}
+            self.cell_size = CELL_SIZE
+            self.painted = n
+
+        # 1) Tô overlay nhạt cho các ô MỚI quét; ô đã tô thì trộn thêm lớp mới.
+        # Ô thuộc tile chưa vẽ thì bỏ qua: tile đó sẽ được tô đủ khi lộ ra
+        t = self.tile_cells()
+        for i in range(self.painted, n):
+            r, c, color = radar_cell(explored[i], self.base_color, self.back_color)
+            tile = self.tiles.get((r // t, c // t))
+            if tile is not None:
+                rgba = (*color, self.ALPHA)
+                if self.order[r, c] != i:
+                    rgba = self._cell_rgba(explored, r, c, i + 1)
+                tile.fill(rgba, ((c % t) * CELL_SIZE, (r % t) * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+        self.painted = n
+
+        if n <= 0:
+            return
+        self.blit_tiles(surface, ox, oy, view, shape)
+
+        # 2) Ô đang quét hiện tại
+        draw_radar_head(surface, explored[n - 1], ox, oy, self.base_color, self.back_color)
+
+    def _build_tile(self, cells):
+        r0, r1, c0, c1 = cells
+        tile = pygame.Surface(((c1 - c0) * CELL_SIZE, (r1 - r0) * CELL_SIZE), pygame.SRCALPHA)
+        tile.fill((0, 0, 0, 0))
+
+        # Cùng quy tắc với tô dần: ô quét nhiều lần trộn mọi lần < painted
+        n = self.painted
+        window = self.order[r0:r1, c0:c1]
+        for r, c in zip(*np.nonzero((window >= 0) & (window < n))):
+            if (r0 + r, c0 + c) in self.repeats:
+                rgba = self._cell_rgba(self.explored, r0 + r, c0 + c, n)
+            else:
+                _, _, color = radar_cell(self.explored[window[r, c]], self.base_color, self.back_color)
+                rgba = (*color, self.ALPHA)
+            tile.fill(rgba, (c * CELL_SIZE, r * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+        return tile
 
-        # Ô overlay bán trong suốt
-        cell_surf = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)
-        # alpha nhỏ cho dịu mắt (40–70 tùy anh)
-        cell_surf.fill((*base_color, 55))
-        surface.blit(cell_surf, (x, y))
 
-    # 2) Ô đang quét hiện tại (node cuối cùng)
-    last_r, last_c = explored[n - 1]
+def draw_radar_head(surface, entry, ox, oy, base_color, back_color=None):
+    """Ô đang quét: viền đậm + chấm tròn sáng (back_color cho sóng từ goal)"""
+    last_r, last_c, cur_color = radar_cell(entry, base_color, back_color)
     lx = ox + last_c * CELL_SIZE
     ly = oy + last_r * CELL_SIZE
 
     # Viền đậm để biết ô hiện tại
-    pygame.draw.rect(surface, base_color, (lx, ly, CELL_SIZE, CELL_SIZE), 3)
+    pygame.draw.rect(surface, cur_color, (lx, ly, CELL_SIZE, CELL_SIZE), 3)
 
     # Chấm tròn sáng ở giữa
     cx = lx + CELL_SIZE // 2
@@ -252,32 +505,327 @@ def draw_radar(surface, explored, ox, oy, base_color, upto):
     radius = max(3, CELL_SIZE // 4)
 
     pulse_surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-    pygame.draw.circle(pulse_surf, (*base_color, 200), (radius, radius), radius)
+    pygame.draw.circle(pulse_surf, (*cur_color, 200), (radius, radius), radius)
     surface.blit(pulse_surf, (cx - radius, cy - radius))
 
-def draw_path(surface, path, ox, oy, color):
+# =============================
+# Vẽ maze rất lớn: 1 ô = 1 pixel
+# =============================
+def panel_size(shape):
+    """Kích thước (px) của maze trong khung; chế độ raster thì co giãn vừa khung"""
+    rows, cols = shape
+    if CELL_SIZE >= RASTER_CELL_SIZE:
+        return cols * CELL_SIZE, rows * CELL_SIZE
+    scale = min(MAZE_FRAME_W / cols, MAZE_FRAME_H / rows)
+    return max(1, int(cols * scale)), max(1, int(rows * scale))
+
+
+class RasterPanel:
+    """
+    Ảnh một khung khi CELL_SIZE < RASTER_CELL_SIZE. Lưới và ô đã quét được
+    tô vào mảng RGB (cols, rows, 3) bằng numpy; Surface small (1 ô = 1 px)
+    chỉ được sửa đúng các ô đổi qua pygame.surfarray.pixels3d, đường đi vẽ
+    thẳng lên small chứ không chép cả lưới. Ô quét mới được tô dần như
+    RadarOverlay; ảnh đã scale chỉ làm lại khi có gì thay đổi.
+    """
+    def __init__(self, scan_color, back_color, path_color):
+        # Hàng 0: sóng từ start, hàng 1: sóng từ goal (BACKWARD)
+        self.scan_colors = np.array([scan_color, back_color], dtype=np.int16)
+        self.path_color = path_color
+        self.mg = None
+        self.key = None
+        self.image = None      # nền + ô đã quét (chưa có đường đi), tô dần
+        self.small = None      # Surface cols x rows = image + đường đi
+        self.scaled = None
+        self.dirty = False     # small đã đổi từ lần scale trước
+        self.explored = None
+        self.painted = 0
+        self.shown = None
+        self.path_shown = None
+
+    def reset(self):
+        self.explored = None
+
+    def _paint_endpoints(self, mg):
+        (sr, sc), (gr, gc) = mg.start, mg.goal
+        self.image[sc, sr] = START_COLOR
+        self.image[gc, gr] = GOAL_COLOR
+
+    def _blend(self, xs, ys, colors):
+        current = self.image[xs, ys].astype(np.int16)
+        self.image[xs, ys] = current + (colors - current) * RadarOverlay.ALPHA // 255
+
+    def _scan(self, xs, ys, colors):
+        """
+        Trộn màu quét lên từng ô theo đúng thứ tự quét, như blit chồng ô
+        radar alpha ALPHA: ô bị quét lại (hai phía của Bidirectional) mang
+        màu của cả hai lớp thay vì bị ghi đè.
+        """
+        ids = xs * self.image.shape[1] + ys
+        _, first = np.unique(ids, return_index=True)
+        self._blend(xs[first], ys[first], colors[first])
+        later = np.ones(len(ids), dtype=bool)
+        later[first] = False
+        for i in np.nonzero(later)[0].tolist():
+            self._blend(xs[i:i + 1], ys[i:i + 1], colors[i:i + 1])
+
+    def _show(self, xs, ys):
+        """Chép các ô (xs = cột, ys = hàng) từ image sang small, đường đi vẫn nằm trên"""
+        pixels = pygame.surfarray.pixels3d(self.small)
+        pixels[xs, ys] = self.image[xs, ys]
+        if self.path_shown:
+            cells = path_array(self.path_shown)
+            pixels[cells[:, 1], cells[:, 0]] = self.path_color
+        del pixels  # nhả khoá surface trước khi scale
+        self.dirty = True
+
+    def draw(self, surface, mg, explored, upto, path, show_path, cam):
+        key = (mg.revision, mg.start, mg.goal)
+        n = min(upto, len(explored))
+
+        if (mg is not self.mg or key != self.key
+                or explored is not self.explored or n < self.painted):
+            walls = np.asarray(mg.maze).T == 1
+            self.image = np.empty(walls.shape + (3,), dtype=np.uint8)
+            self.image[...] = BG_COLOR
+            self.image[walls] = PAC_WALL_COLOR
+            self._paint_endpoints(mg)
+            if self.small is None or self.small.get_size() != walls.shape:
+                self.small = pygame.Surface(walls.shape).convert()
+            pygame.surfarray.blit_array(self.small, self.image)
+            self.mg, self.key = mg, key
+            self.explored, self.painted = explored, 0
+            self.path_shown = None
+            self.dirty = True
+
+        if n > self.painted:
+            cells = np.asarray(explored[self.painted:n])
+            side = cells[:, 2] if cells.shape[1] == 3 else np.zeros(len(cells), dtype=np.intp)
+            xs, ys = cells[:, 1], cells[:, 0]
+            self._scan(xs, ys, self.scan_colors[side])
+            self._paint_endpoints(mg)
+            self._show(xs, ys)
+            self.painted = n
+
+        path = path if show_path else None
+        if path is not self.path_shown:
+            old = path_array(self.path_shown) if self.path_shown else np.empty((0, 2), dtype=np.intp)
+            self.path_shown = path
+            self._show(old[:, 1], old[:, 0])
+
+        # Chỉ phần lưới trong khung nhìn được scale ra màn hình
+        scale = cam.draw_scale
+        ox, oy = cam.origin(scale)
+        r0, r1, c0, c1 = cam.visible(scale)
+        size = (max(1, round((c1 - c0) * scale)), max(1, round((r1 - r0) * scale)))
+
+        shown = ((r0, r1, c0, c1), size)
+        if self.dirty or shown != self.shown:
+            if self.scaled is None or self.scaled.get_size() != size:
+                self.scaled = pygame.Surface(size).convert()
+            window = self.small.subsurface((c0, r0, max(1, c1 - c0), max(1, r1 - r0)))
+            pygame.transform.scale(window, size, self.scaled)
+            self.shown = shown
+            self.dirty = False
+
+        surface.blit(self.scaled, (round(ox + c0 * scale), round(oy + r0 * scale)))
+
+    def draw_robot(self, surface, path, idx, cam, color):
+        if not path or idx >= len(path):
+            return
+        scale = cam.draw_scale
+        ox, oy = cam.origin(scale)
+        r, c = path[idx]
+        x = round(ox + (c + 0.5) * scale)
+        y = round(oy + (r + 0.5) * scale)
+        pygame.draw.circle(surface, color, (x, y), max(4, int(scale) // 2 - 2))
+
+
+_path_arrays = {}   # id(path) -> (path, mảng (n, 2)); path giữ nguyên giữa các frame
+
+
+def path_array(path):
+    entry = _path_arrays.get(id(path))
+    if entry is None or entry[0] is not path:
+        if len(_path_arrays) >= 8:
+            _path_arrays.clear()
+        entry = _path_arrays[id(path)] = (path, np.asarray(path).reshape(-1, 2))
+    return entry[1]
+
+
+def draw_path(surface, path, ox, oy, color, view=None):
     if not path:
         return
 
-    # Vẽ đường đi bằng line + chấm tròn cho dễ nhìn
-    points = []
-    for r, c in path:
-        x = ox + c * CELL_SIZE + CELL_SIZE // 2
-        y = oy + r * CELL_SIZE + CELL_SIZE // 2
-        points.append((x, y))
+    # Chỉ giữ các đoạn có ô trong khung nhìn (thêm 1 ô biên để line không bị cụt)
+    runs = [range(len(path))]
+    if view:
+        cells = path_array(path)
+        r0, r1, c0, c1 = view
+        inside = ((cells[:, 0] >= r0 - 1) & (cells[:, 0] <= r1)
+                  & (cells[:, 1] >= c0 - 1) & (cells[:, 1] <= c1))
+        idx = np.flatnonzero(inside)
+        breaks = np.flatnonzero(np.diff(idx) > 1) + 1
+        runs = [range(run[0], run[-1] + 1) for run in np.split(idx, breaks) if len(run)]
+
+    for run in runs:
+        # Vẽ đường đi bằng line + chấm tròn cho dễ nhìn
+        points = []
+        for i in run:
+            r, c = path[i]
+            x = ox + c * CELL_SIZE + CELL_SIZE // 2
+            y = oy + r * CELL_SIZE + CELL_SIZE // 2
+            points.append((x, y))
+
+        # Vẽ line nối các điểm
+        if len(points) >= 2:
+            pygame.draw.lines(surface, color, False, points, 4)
+
+        # Vẽ chấm nhỏ trên từng ô cho rõ hơn
+        for x, y in points:
+            pygame.draw.circle(surface, color, (x, y), 4)
 
-    # Vẽ line nối các điểm
-    if len(points) >= 2:
-        pygame.draw.lines(surface, color, False, points, 4)
 
-    # Vẽ chấm nhỏ trên từng ô cho rõ hơn
-    for x, y in points:
-        pygame.draw.circle(surface, color, (x, y), 4)
+# =============================
+# Camera: zoom / pan / follow cho từng khung
+# =============================
+class Camera:
+    """
+    Camera của một khung cố định (frame). scale = số px mỗi ô, không nhỏ hơn
+    mức vừa khung; (cx, cy) = tâm nhìn theo toạ độ ô. Lăn chuột để zoom quanh
+    con trỏ, kéo chuột phải để pan, follow bám theo robot. visible() cho
+    khung nhìn để các hàm vẽ bỏ qua ô nằm ngoài.
+    """
+    MAX_SCALE = 64
+    ZOOM_STEP = 1.25
+
+    def __init__(self, frame):
+        self.frame = pygame.Rect(frame)
+        self.shape = (1, 1)
+        self.fit_scale = self.scale = 1.0
+        self.cx = self.cy = 0.5
+        self.follow = False
+        self.drag = None
+
+    def fit(self, shape):
+        """Vừa cả maze vào khung (như bố cục không có camera)"""
+        rows, cols = shape
+        self.shape = shape
+        self.fit_scale = self.scale = min(self.frame.w / cols, self.frame.h / rows)
+        self.cx, self.cy = cols / 2, rows / 2
+
+    @property
+    def raster(self):
+        return int(self.scale) < RASTER_CELL_SIZE
+
+    @property
+    def draw_scale(self):
+        """px mỗi ô khi vẽ: số nguyên (CELL_SIZE) ở chế độ thường, số thực khi raster"""
+        return self.scale if self.raster else int(self.scale)
+
+    def origin(self, scale):
+        """Toạ độ màn hình của góc ô (0, 0)"""
+        return (self.frame.x + math.floor(self.frame.w / 2 - self.cx * scale),
+                self.frame.y + math.floor(self.frame.h / 2 - self.cy * scale))
+
+    def visible(self, scale):
+        """(r0, r1, c0, c1): các ô nằm (một phần) trong khung"""
+        rows, cols = self.shape
+        ox, oy = self.origin(scale)
+        c0 = max(0, math.floor((self.frame.left - ox) / scale))
+        c1 = min(cols, math.ceil((self.frame.right - ox) / scale))
+        r0 = max(0, math.floor((self.frame.top - oy) / scale))
+        r1 = min(rows, math.ceil((self.frame.bottom - oy) / scale))
+        return r0, max(r0, r1), c0, max(c0, c1)
+
+    def clamp(self):
+        rows, cols = self.shape
+        if self.scale <= self.fit_scale:
+            self.scale = self.fit_scale
+            self.cx, self.cy = cols / 2, rows / 2
+        self.cx = min(max(self.cx, 0), cols)
+        self.cy = min(max(self.cy, 0), rows)
+
+    def zoom_at(self, pos, factor):
+        # Giữ nguyên ô nằm dưới con trỏ
+        scale = self.draw_scale
+        ox, oy = self.origin(scale)
+        u = (pos[0] - ox) / scale
+        v = (pos[1] - oy) / scale
+
+        self.scale = min(max(self.scale * factor, self.fit_scale), self.MAX_SCALE)
+        scale = self.draw_scale
+        self.cx = u - (pos[0] - self.frame.x - self.frame.w / 2) / scale
+        self.cy = v - (pos[1] - self.frame.y - self.frame.h / 2) / scale
+        self.clamp()
+
+    def center_on(self, cell):
+        self.cx, self.cy = cell[1] + 0.5, cell[0] + 0.5
+        self.clamp()
+
+    def cell_at(self, pos):
+        if not self.frame.collidepoint(pos):
+            return None
+        scale = self.draw_scale
+        ox, oy = self.origin(scale)
+        r = math.floor((pos[1] - oy) / scale)
+        c = math.floor((pos[0] - ox) / scale)
+        rows, cols = self.shape
+        if 0 <= r < rows and 0 <= c < cols:
+            return r, c
+        return None
+
+    def handle_event(self, event):
+        """Lăn chuột: zoom; chuột phải: kéo để pan. True nếu event thuộc về camera"""
+        if event.type == pygame.MOUSEWHEEL:
+            pos = pygame.mouse.get_pos()
+            if self.frame.collidepoint(pos):
+                self.zoom_at(pos, self.ZOOM_STEP ** event.y)
+                return True
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 3:
+            if self.frame.collidepoint(event.pos):
+                self.drag = event.pos
+                return True
+        elif event.type == pygame.MOUSEMOTION and self.drag:
+            scale = self.draw_scale
+            self.cx -= (event.pos[0] - self.drag[0]) / scale
+            self.cy -= (event.pos[1] - self.drag[1]) / scale
+            self.drag = event.pos
+            self.clamp()
+            return True
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 3 and self.drag:
+            self.drag = None
+            return True
+        return False
+
+
+def draw_panel(surface, cam, mg, layer, radar, raster, explored, upto, path, idx,
+               show_path, path_color):
+    """Vẽ một khung qua camera: chỉ các ô trong khung nhìn, cắt theo khung"""
+    global CELL_SIZE
+
+    surface.set_clip(cam.frame)
+    if cam.raster:
+        # Maze rất lớn: cả khung là một ảnh numpy scale ra
+        raster.draw(surface, mg, explored, upto, path, show_path, cam)
+        if show_path:
+            raster.draw_robot(surface, path, idx, cam, path_color)
+    else:
+        fit_cell, CELL_SIZE = CELL_SIZE, cam.draw_scale
+        ox, oy = cam.origin(CELL_SIZE)
+        view = cam.visible(CELL_SIZE)
+
+        layer.draw(surface, mg, ox, oy, view)
+        radar.draw(surface, explored, ox, oy, upto, mg.maze.shape, view)
+        if show_path:
+            draw_path(surface, path, ox, oy, path_color, view)
+            draw_robot(surface, path, idx, ox, oy, path_color, view)
+        CELL_SIZE = fit_cell
+    surface.set_clip(None)
 
 
 def draw_label(surface, text, x, y):
-    font = pygame.font.SysFont("segoeui", 26, bold=True)
-    label = font.render(text, True, (230, 230, 255))
+    label = TEXT_CACHE.render(text, (230, 230, 255), 26, bold=True)
     surface.blit(label, (x, y))
 
 
@@ -285,9 +833,12 @@ def draw_label(surface, text, x, y):
 # HUD (Stats Card)
 # =============================
 def draw_hud(surface, speed, paused, mode, dij_stats, ast_stats,
-             left_ox, right_ox, maze_w):
-    font_title = pygame.font.SysFont("segoeui", 22, bold=True)
-    font_body = pygame.font.SysFont("segoeui", 18)
+             left_ox, right_ox, maze_w, repair=None, solving=(), frame_time=None, queued=0):
+    def title(text, color):
+        return TEXT_CACHE.render(text, color, 22, bold=True)
+
+    def body(text):
+        return TEXT_CACHE.render(text, HUD_COLOR, 18)
 
     # ===== Top status line =====
     top_text = (
@@ -295,13 +846,30 @@ def draw_hud(surface, speed, paused, mode, dij_stats, ast_stats,
         f"State: {'PAUSED' if paused else 'RUNNING'}   •   "
         f"Mode: {mode}"
     )
-
-    img = font_title.render(top_text, True, HUD_COLOR)
-    surface.blit(img, (surface.get_width()//2 - img.get_width()//2, 70))
+    if queued:
+        top_text += f"   •   Repair: preparing LPA* ({queued} queued)"
+    elif repair:
+        # setup: lần giải đầu của LPA*, chạy ở worker nên không chặn khung hình
+        repair_time, repair_nodes, setup_time = repair
+        top_text += (f"   •   Repair: {repair_time * 1000:.2f} ms / {repair_nodes} nodes"
+                     f" (setup {setup_time * 1000:.0f} ms)")
+    img = title(top_text, HUD_COLOR)
+
+    # Frame time đổi mỗi frame: render riêng để phần còn lại vẫn trúng cache
+    if frame_time is not None:
+        frame_img = title(f"   •   Frame: {frame_time * 1000:.2f} ms", HUD_COLOR)
+        x = surface.get_width()//2 - (img.get_width() + frame_img.get_width())//2
+        surface.blit(img, (x, 70))
+        surface.blit(frame_img, (x + img.get_width(), 70))
+    else:
+        surface.blit(img, (surface.get_width()//2 - img.get_width()//2, 70))
 
     # ===== Card size =====
+    # Có số liệu solver thì nới thẻ ra gần hết khung để thêm 2 cột
     card_w = 270
     card_h = 95
+    if dij_stats.get("solver") or ast_stats.get("solver"):
+        card_w = 560
 
     # Dijkstra card position
     dij_x = left_ox + maze_w//2 - card_w//2
@@ -311,43 +879,97 @@ def draw_hud(surface, speed, paused, mode, dij_stats, ast_stats,
     ast_x = right_ox + maze_w//2 - card_w//2
     ast_y = TOP_RESERVED - 50
 
-    def draw_card(x, y, title, stats, color):
+    def draw_card(x, y, name, stats, color):
         rect = pygame.Rect(x, y, card_w, card_h)
         pygame.draw.rect(surface, (20, 20, 35), rect, border_radius=12)
         pygame.draw.rect(surface, color, rect, 2, border_radius=12)
 
         # Title
-        title_txt = font_title.render(title, True, color)
+        title_txt = title(name, color)
         surface.blit(title_txt, (x + 12, y + 8))
 
+        if stats.get("solving"):
+            surface.blit(body("Solving..."), (x + 12, y + 34))
+            return
+
         # Stats
         steps = stats["steps"]
         nodes = stats["scanned"]      # node đã quét
         time_ms = stats["time"] * 1000
 
         # Hàng 1: Steps + Nodes
-        surface.blit(font_body.render(f"Steps: {steps}", True, HUD_COLOR),
+        surface.blit(body(f"Steps: {steps}"),
                      (x + 12, y + 34))
-        surface.blit(font_body.render(f"Nodes: {nodes}", True, HUD_COLOR),
+        surface.blit(body(f"Nodes: {nodes}"),
                      (x + 140, y + 34))
 
         # Hàng 2: Time + FPS
-        surface.blit(font_body.render(f"Time: {time_ms:.1f} ms", True, HUD_COLOR),
+        surface.blit(body(f"Time: {time_ms:.1f} ms"),
                      (x + 12, y + 58))
 
-    if mode in ["Dijkstra", "Compare"]:
-        draw_card(dij_x, dij_y, "Dijkstra", dij_stats, (130, 150, 255))
+        # Số liệu solver (khi SOLVER_STATS bật và thuật toán hỗ trợ)
+        solver = stats.get("solver")
+        if solver:
+            nb_ms = solver["neighbor_time"] * 1000
+            # Số liệu từ lần chạy bản đo riêng; "Time" vẫn là bản thường
+            surface.blit(body(f"Instrumented  •  Neighbors: {nb_ms:.2f} ms"),
+                         (x + 270, y + 10))
+            surface.blit(body(
+                f"Push/Pop: {solver['heap_pushes']}/{solver['heap_pops']}"),
+                (x + 270, y + 34))
+            surface.blit(body(
+                f"Stale: {solver['stale_pops']}  Relax: {solver['relaxations']}"),
+                (x + 270, y + 58))
+            surface.blit(body(f"Peak open: {solver['peak_open']}"),
+                         (x + 430, y + 34))
+            surface.blit(body(f"Dist map: {solver['max_dist']}"),
+                         (x + 430, y + 58))
+
+    left_title, right_title = PANEL_TITLES.get(mode, ("Dijkstra", "A*"))
+
+    if mode in LEFT_PANEL_MODES:
+        draw_card(dij_x, dij_y, left_title, {**dij_stats, "solving": "left" in solving},
+                  (130, 150, 255))
+
+    if mode in RIGHT_PANEL_MODES:
+        draw_card(ast_x, ast_y, right_title, {**ast_stats, "solving": "right" in solving},
+                  (255, 160, 255))
+
 
-    if mode in ["A*", "Compare"]:
-        draw_card(ast_x, ast_y, "A*", ast_stats, (255, 160, 255))
+# =============================
+# Debug overlay (phím F3)
+# =============================
+def draw_debug(surface, cache, frame_hits, frame_misses, layers=()):
+    """
+    Text cache hit rates and maze layer tiles drawn; rendered without the
+    cache so it does not skew them
+    """
+    font = get_font(16)
+    lines = [
+        f"Text cache: {cache.hit_rate() * 100:.1f}% hit  "
+        f"({cache.hits} hits / {cache.misses} misses)",
+        f"This frame: {frame_hits} hits / {frame_misses} misses",
+        f"Surfaces: {len(cache.surfaces)}/{cache.capacity}   Fonts: {len(_FONTS)}",
+    ]
+    if layers:
+        lines.append("Maze layer tiles drawn: " + " / ".join(str(layer.builds) for layer in layers))
+
+    w = max(font.size(line)[0] for line in lines) + 20
+    h = len(lines) * 20 + 12
+    y0 = surface.get_height() - h - 10
+    box = pygame.Surface((w, h), pygame.SRCALPHA)
+    box.fill((20, 20, 35, 210))
+    surface.blit(box, (10, y0))
+    for i, line in enumerate(lines):
+        surface.blit(font.render(line, True, HUD_COLOR), (20, y0 + 6 + i * 20))
 
 
 # =============================
 # Stats nội suy (giữ nguyên)
 # =============================
-def get_progress_stats(path, explored, idx_step, idx_scan, total_time):
+def get_progress_stats(path, explored, idx_step, idx_scan, total_time, solver=None):
     if not path or not explored:
-        return {"steps": 0, "scanned": 0, "time": 0}
+        return {"steps": 0, "scanned": 0, "time": 0, "solver": solver}
 
     total_steps = len(path)
     total_scanned = len(explored)
@@ -363,31 +985,202 @@ def get_progress_stats(path, explored, idx_step, idx_scan, total_time):
         "steps": steps_now,
         "scanned": scanned_now,
         "time": total_time * progress,
+        "solver": solver,
     }
 
 
 # =============================
 # Generate Maze + time
 # =============================
+# Thuật toán cho (khung trái, khung phải) theo từng mode
+PANEL_SOLVERS = {
+    "Bidirectional": (bidirectional_bfs, bidirectional_astar),
+}
+PANEL_TITLES = {
+    "Bidirectional": ("Bi-BFS", "Bi-A*"),
+}
+LEFT_PANEL_MODES = ["Dijkstra", "Compare", "Bidirectional"]
+RIGHT_PANEL_MODES = ["A*", "Compare", "Bidirectional"]
+
+
+class PanelJobs:
+    """
+    Giải hai khung song song trong process pool để vòng lặp pygame vẫn vẽ
+    đủ FPS. submit() gửi cả hai thuật toán; poll() mỗi frame trả về các
+    khung đã xong. Kết quả của lần submit cũ bị bỏ qua; job cũ còn đang
+    chạy quá STALE_JOB_GRACE thì pool bị thay mới để job mới không phải xếp
+    hàng sau nó.
+    new_maze() còn dựng sẵn LPA* cho thao tác sửa tường (poll_planner()).
+    Maze lớn được publish một lần vào shared memory, worker chỉ attach.
+    """
+    def __init__(self, workers=3):
+        self.workers = workers
+        self.pool = self._new_pool()
+        self.jobs = {}           # "left" / "right" -> Future
+        self.planner_job = None  # Future của prepared_planner
+        self.planner_for = None  # maze mà planner đang dựng thuộc về
+        self.tasks = {}          # key -> (hàm, tham số) để gửi lại khi thay pool
+        self.sent = {}           # Future -> thời điểm gửi
+        self.shared = None
+        self.shared_key = None   # (mg, revision) đã publish
+
+    def _new_pool(self):
+        # "spawn": không fork tiến trình đang giữ SDL/pygame
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=get_context("spawn"))
+
+    def _maze_arg(self, mg):
+        """(maze hoặc descriptor, có dùng shared memory không) cho worker"""
+        if mg.width * mg.height < SHARED_MAZE_CELLS:
+            return mg, False
+        if self.shared_key != (mg, mg.revision):
+            self._release_shared()
+            self.shared = SharedMaze.publish(mg)
+            self.shared_key = (mg, mg.revision)
+        return self.shared.descriptor, True
+
+    def _release_shared(self):
+        # Chỉ gọi khi không còn job nào có thể attach segment này
+        if self.shared is not None:
+            self.shared.close()
+            self.shared = self.shared_key = None
+
+    def _submit(self, key, fn, *args):
+        self.tasks[key] = (fn, args)
+        future = self.pool.submit(fn, *args)
+        self.sent[future] = time.perf_counter()
+        return future
+
+    def submit(self, mg, mode):
+        self.cancel()
+        left_solver, right_solver = PANEL_SOLVERS.get(mode, (dijkstra, astar))
+        arg, shared = self._maze_arg(mg)
+        fn = timed_solve_shared if shared else timed_solve
+        self.jobs = {
+            "left": self._submit("left", fn, left_solver, arg, SOLVER_STATS),
+            "right": self._submit("right", fn, right_solver, arg, SOLVER_STATS),
+        }
+
+    def new_maze(self, mg, mode):
+        """Maze mới: bỏ mọi job cũ, dựng LPA* và giải hai khung"""
+        futures = list(self.jobs.values()) + ([self.planner_job] if self.planner_job else [])
+        self._drop(futures, "left", "right", "planner")
+        self.jobs, self.planner_job = {}, None
+        self.submit(mg, mode)
+        arg, shared = self._maze_arg(mg)
+        fn = prepared_planner_shared if shared else prepared_planner
+        self.planner_job = self._submit("planner", fn, arg)
+        self.planner_for = mg
+
+    def solving(self, side=None):
+        return bool(self.jobs) if side is None else side in self.jobs
+
+    def poll(self):
+        """[(side, (path, explored, time, stats))] của các khung vừa xong"""
+        done = []
+        for side, future in list(self.jobs.items()):
+            if future.done():
+                del self.jobs[side]
+                self.tasks.pop(side, None)
+                self.sent.pop(future, None)
+                done.append((side, future.result()))
+        return done
+
+    def poll_planner(self, mg):
+        """(planner, thời gian dựng) khi LPA* của mg vừa xong, gắn lại vào mg; không thì None"""
+        future = self.planner_job
+        if future is None or not future.done():
+            return None
+        self.planner_job = None
+        self.tasks.pop("planner", None)
+        self.sent.pop(future, None)
+        planner, setup_time = future.result()
+        if self.planner_for is not mg or planner.revision != mg.revision:
+            return None
+        planner.maze = mg
+        return planner, setup_time
+
+    def cancel(self):
+        self._drop(list(self.jobs.values()), "left", "right")
+        self.jobs = {}
+
+    def _drop(self, futures, *keys):
+        """
+        Bỏ các job đã cũ. Future.cancel() không dừng được job đang chạy: khi
+        đó thay cả pool và gửi lại các job còn giá trị sang pool mới.
+        """
+        for key in keys:
+            self.tasks.pop(key, None)
+        # Job mới gửi thường xong ngay (maze nhỏ): để nó chạy nốt, khỏi spawn lại worker
+        now = time.perf_counter()
+        running = [f for f in futures if not f.cancel() and not f.done()
+                   and now - self.sent.get(f, now) > STALE_JOB_GRACE]
+        for future in futures:
+            self.sent.pop(future, None)
+        if not running:
+            return
+        self._terminate_pool()
+        self.pool = self._new_pool()
+        for key, (fn, args) in self.tasks.items():
+            future = self.planner_job if key == "planner" else self.jobs.get(key)
+            if future is None or future.done():
+                continue
+            if key == "planner":
+                self.planner_job = self._submit(key, fn, *args)
+            else:
+                self.jobs[key] = self._submit(key, fn, *args)
+
+    def _terminate_pool(self):
+        pool = self.pool
+        pool.shutdown(wait=False, cancel_futures=True)
+        terminate = getattr(pool, "terminate_workers", None)  # Python 3.14+
+        if terminate is not None:
+            terminate()
+            return
+        for process in list((pool._processes or {}).values()):
+            process.terminate()
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self._release_shared()
+
+
 def generate_valid_maze(mg):
-    while True:
+    # Generator đảm bảo liên thông thì bỏ qua kiểm tra (gán nhãn cả lưới
+    # 2001² tốn ~1.6 s); còn lại kiểm tra bằng gán nhãn thành phần thay vì
+    # giải thử. Việc giải do PanelJobs làm ở tiến trình khác.
+    maze, start, goal = mg.generate_maze()
+    while not mg.always_connected and not mg.is_connected(start, goal):
         maze, start, goal = mg.generate_maze()
 
-        t0 = time.perf_counter()
-        dij_path, dij_cost, dij_scan = dijkstra(mg)
-        dij_time = time.perf_counter() - t0
+    return maze, start, goal
 
-        t1 = time.perf_counter()
-        ast_path, ast_cost, ast_scan = astar(mg)
-        ast_time = time.perf_counter() - t1
 
-        if dij_path and ast_path:
-            return (
-                maze, start, goal,
-                dij_path, ast_path,
-                dij_scan, ast_scan,
-                dij_time, ast_time
-            )
+# =============================
+# Sửa tường bằng chuột + LPA*
+# =============================
+def toggle_wall(mg, planner, cell):
+    """
+    Đảo tường tại cell rồi sửa đường bằng LPA* (planner dựng sẵn ở worker bởi
+    PanelJobs.new_maze, giữ trạng thái giữa các lần).
+    Trả về (thời gian sửa, số node mở lại), hoặc None nếu không đổi được:
+    ô biên, start/goal, hoặc thao tác làm mất đường đi.
+    """
+    r, c = cell
+    if not (0 < r < mg.height - 1 and 0 < c < mg.width - 1) or cell in (mg.start, mg.goal):
+        return None
+
+    mg.set_wall(r, c, mg.maze[r, c] == 0)
+    t0 = time.perf_counter()
+    path, cost, explored = planner.update([cell])
+    repair_time = time.perf_counter() - t0
+
+    if path is None:
+        # Không cho chặn hết đường: hoàn tác
+        mg.set_wall(r, c, mg.maze[r, c] == 0)
+        planner.update([cell])
+        return None
+
+    return repair_time, len(explored)
 
 
 # =============================
@@ -400,17 +1193,17 @@ def main():
     pygame.display.set_caption("Soft Neon Maze Visualizer (Updated UI)")
     clock = pygame.time.Clock()
 
-    mg = MazeGenerator(31, 21)
-
-    (
-        maze, start, goal,
-        dij_path, ast_path,
-        dij_scan, ast_scan,
-        dij_time, ast_time
-    ) = generate_valid_maze(mg)
+    mg = MazeGenerator(31, 21, algorithm=MAZE_ALGORITHM)
+    maze, start, goal = generate_valid_maze(mg)
 
-    dij_total_time = dij_time
-    ast_total_time = ast_time
+    # Kết quả của từng khung; rỗng cho tới khi PanelJobs giải xong
+    jobs = PanelJobs()
+    jobs.new_maze(mg, "Compare")
+    skip_scan = False   # True: kết quả mới hiện ngay, không chạy lại radar
+    dij_path, ast_path = [], []
+    dij_scan, ast_scan = [], []
+    dij_total_time = ast_total_time = 0
+    dij_solver = ast_solver = None
 
     # -------------------------------
     # AUTO SCALE CELL SIZE
@@ -421,8 +1214,7 @@ def main():
     cell_h = MAZE_FRAME_H // rows
     CELL_SIZE = min(cell_w, cell_h)
 
-    maze_w = cols * CELL_SIZE
-    maze_h = rows * CELL_SIZE
+    maze_w = panel_size(maze.shape)[0]  # thẻ HUD canh giữa theo bề rộng maze
 
     screen_w = PADDING + MAZE_FRAME_W + GAP + MAZE_FRAME_W + PADDING
     screen_h = TOP_RESERVED + MAZE_FRAME_H + 50
@@ -430,14 +1222,18 @@ def main():
     screen = pygame.display.set_mode((screen_w, screen_h))
 
     # -------------------------------
-    # Center maze inside frame
+    # Khung hai panel (maze vẽ qua Camera); ox chỉ dùng canh thẻ HUD
     # -------------------------------
     left_ox = PADDING + (MAZE_FRAME_W - maze_w) // 2
-    left_oy = TOP_RESERVED + (MAZE_FRAME_H - maze_h) // 2
 
     right_frame_x = PADDING + MAZE_FRAME_W + GAP
     right_ox = right_frame_x + (MAZE_FRAME_W - maze_w) // 2
-    right_oy = left_oy
+
+    # Camera cho từng khung (lăn chuột: zoom, chuột phải: pan, F: follow, 0: vừa khung)
+    left_cam = Camera((PADDING, TOP_RESERVED, MAZE_FRAME_W, MAZE_FRAME_H))
+    right_cam = Camera((right_frame_x, TOP_RESERVED, MAZE_FRAME_W, MAZE_FRAME_H))
+    left_cam.fit(maze.shape)
+    right_cam.fit(maze.shape)
 
 
     # ===========================================
@@ -465,9 +1261,23 @@ def main():
     robot_t = 0
     scan_done = False
 
+    planner = None   # LPA* cho thao tác sửa tường; dựng ở worker, có khi poll_planner() xong
+    planner_setup = 0.0
+    pending_cells = []  # click khi LPA* chưa sẵn sàng, áp theo thứ tự khi có planner
+    dij_layer, ast_layer = MazeLayer(), MazeLayer()
+    dij_radar = RadarOverlay(DIJ_RADAR_COLOR, DIJ_RADAR_BACK_COLOR)
+    ast_radar = RadarOverlay(AST_RADAR_COLOR, AST_RADAR_BACK_COLOR)
+    dij_raster = RasterPanel(DIJ_RADAR_COLOR, DIJ_RADAR_BACK_COLOR, DIJ_PATH_COLOR)
+    ast_raster = RasterPanel(AST_RADAR_COLOR, AST_RADAR_BACK_COLOR, AST_PATH_COLOR)
+    frame_time = None   # thời gian xử lý + vẽ một frame (trung bình trượt)
+    show_debug = False  # F3: overlay tỉ lệ trúng cache chữ
+    repair = None
+
     running = True
     while running:
         dt = clock.tick(FPS) / 1000
+        frame_t0 = time.perf_counter()
+        hits0, misses0 = TEXT_CACHE.hits, TEXT_CACHE.misses
 
         # ======= GLOBAL TIME SCALE =======
         time_scale = 1.0 / MOVE_DELAY
@@ -487,12 +1297,51 @@ def main():
             # =============================
             # MODE change
             # =============================
+            dropdown_open = btn_mode.open
             mode_change = btn_mode.handle_event(event)
             if mode_change:
-                dij_i = ast_i = 0
-                dij_scan_i = ast_scan_i = 0
-                dij_scan_t = ast_scan_t = 0
-                scan_done = False
+                jobs.submit(mg, mode_change)
+                skip_scan = False
+                dij_radar.reset()
+                ast_radar.reset()
+                dij_raster.reset()
+                ast_raster.reset()
+
+            # =============================
+            # Camera: zoom / pan / follow
+            # =============================
+            for cam in (left_cam, right_cam):
+                cam.handle_event(event)
+
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_f:
+                    follow = not left_cam.follow
+                    left_cam.follow = right_cam.follow = follow
+                if event.key == pygame.K_F3:
+                    show_debug = not show_debug
+                if event.key in (pygame.K_0, pygame.K_HOME):
+                    left_cam.fit(maze.shape)
+                    right_cam.fit(maze.shape)
+
+            # =============================
+            # Click vào mê cung: đảo tường + sửa đường
+            # =============================
+            if (event.type == pygame.MOUSEBUTTONDOWN and event.button == 1
+                    and not dropdown_open):
+                cell = None
+                if btn_mode.current in LEFT_PANEL_MODES:
+                    cell = left_cam.cell_at(event.pos)
+                if cell is None and btn_mode.current in RIGHT_PANEL_MODES:
+                    cell = right_cam.cell_at(event.pos)
+
+                if cell is not None and planner is None:
+                    pending_cells.append(cell)
+                elif cell is not None:
+                    changed = toggle_wall(mg, planner, cell)
+                    if changed:
+                        repair = (*changed, planner_setup)
+                        jobs.submit(mg, btn_mode.current)
+                        skip_scan = True
 
             # =============================
             # Replay
@@ -501,6 +1350,10 @@ def main():
                 dij_i = ast_i = 0
                 dij_scan_i = ast_scan_i = len(dij_scan)
                 scan_done = True
+                dij_radar.reset()
+                ast_radar.reset()
+                dij_raster.reset()
+                ast_raster.reset()
 
             # Pause
             if btn_pause.is_clicked(event):
@@ -508,20 +1361,14 @@ def main():
 
             # Reload
             if btn_reload.is_clicked(event):
-                (
-                    maze, start, goal,
-                    dij_path, ast_path,
-                    dij_scan, ast_scan,
-                    dij_time, ast_time
-                ) = generate_valid_maze(mg)
-
-                dij_total_time = dij_time
-                ast_total_time = ast_time
-
-                dij_i = ast_i = 0
-                dij_scan_i = ast_scan_i = 0
-                dij_scan_t = ast_scan_t = 0
-                scan_done = False
+                maze, start, goal = generate_valid_maze(mg)
+                jobs.new_maze(mg, btn_mode.current)
+                planner, pending_cells = None, []
+                skip_scan = False
+                dij_radar.reset()
+                ast_radar.reset()
+                dij_raster.reset()
+                ast_raster.reset()
 
             # =============================
             # SPEED
@@ -536,14 +1383,15 @@ def main():
             # MAZE SIZE CHANGE  + AUTO SCALE
             # =============================
             if btn_size_plus.is_clicked(event):
-                mg = MazeGenerator(mg.width + 2, mg.height + 2)
-
-                (
-                    maze, start, goal,
-                    dij_path, ast_path,
-                    dij_scan, ast_scan,
-                    dij_time, ast_time
-                ) = generate_valid_maze(mg)
+                mg = MazeGenerator(mg.width + 2, mg.height + 2, algorithm=MAZE_ALGORITHM)
+                maze, start, goal = generate_valid_maze(mg)
+                jobs.new_maze(mg, btn_mode.current)
+                planner, pending_cells = None, []
+                skip_scan = False
+                dij_radar.reset()
+                ast_radar.reset()
+                dij_raster.reset()
+                ast_raster.reset()
 
                 # RECALCULATE SCALE
                 rows, cols = maze.shape
@@ -551,34 +1399,26 @@ def main():
                 cell_h = MAZE_FRAME_H // rows
                 CELL_SIZE = min(cell_w, cell_h)
 
-                maze_w = cols * CELL_SIZE
-                maze_h = rows * CELL_SIZE
+                maze_w = panel_size(maze.shape)[0]
 
                 left_ox = PADDING + (MAZE_FRAME_W - maze_w) // 2
-                left_oy = TOP_RESERVED + (MAZE_FRAME_H - maze_h) // 2
 
                 right_ox = right_frame_x + (MAZE_FRAME_W - maze_w) // 2
-                right_oy = left_oy
-
-                dij_total_time = dij_time
-                ast_total_time = ast_time
-
-                dij_i = ast_i = 0
-                dij_scan_i = ast_scan_i = 0
-                dij_scan_t = ast_scan_t = 0
-                scan_done = False
+                left_cam.fit(maze.shape)
+                right_cam.fit(maze.shape)
 
             # Decrease maze size
             if btn_size_minus.is_clicked(event):
                 if mg.width > 9 and mg.height > 9:
-                    mg = MazeGenerator(mg.width - 2, mg.height - 2)
-
-                    (
-                        maze, start, goal,
-                        dij_path, ast_path,
-                        dij_scan, ast_scan,
-                        dij_time, ast_time
-                    ) = generate_valid_maze(mg)
+                    mg = MazeGenerator(mg.width - 2, mg.height - 2, algorithm=MAZE_ALGORITHM)
+                    maze, start, goal = generate_valid_maze(mg)
+                    jobs.new_maze(mg, btn_mode.current)
+                    planner, pending_cells = None, []
+                    skip_scan = False
+                    dij_radar.reset()
+                    ast_radar.reset()
+                    dij_raster.reset()
+                    ast_raster.reset()
 
                     # AUTO SCALE AGAIN
                     rows, cols = maze.shape
@@ -586,23 +1426,55 @@ def main():
                     cell_h = MAZE_FRAME_H // rows
                     CELL_SIZE = min(cell_w, cell_h)
 
-                    maze_w = cols * CELL_SIZE
-                    maze_h = rows * CELL_SIZE
+                    maze_w = panel_size(maze.shape)[0]
 
                     left_ox = PADDING + (MAZE_FRAME_W - maze_w) // 2
-                    left_oy = TOP_RESERVED + (MAZE_FRAME_H - maze_h) // 2
 
                     right_ox = right_frame_x + (MAZE_FRAME_W - maze_w) // 2
-                    right_oy = left_oy
+                    left_cam.fit(maze.shape)
+                    right_cam.fit(maze.shape)
 
-                    dij_total_time = dij_time
-                    ast_total_time = ast_time
 
-                    dij_i = ast_i = 0
-                    dij_scan_i = ast_scan_i = 0
-                    dij_scan_t = ast_scan_t = 0
-                    scan_done = False
+        # ===============================
+        # LPA* DỰNG XONG Ở WORKER: áp các click đang chờ
+        # ===============================
+        prepared = jobs.poll_planner(mg)
+        if prepared is not None:
+            planner, planner_setup = prepared
+            changed_any = False
+            for cell in pending_cells:
+                changed = toggle_wall(mg, planner, cell)
+                if changed:
+                    repair = (*changed, planner_setup)
+                    changed_any = True
+            pending_cells = []
+            if changed_any:
+                jobs.submit(mg, btn_mode.current)
+                skip_scan = True
 
+        # ===============================
+        # KẾT QUẢ GIẢI TỪ PROCESS POOL
+        # ===============================
+        if jobs.solving():
+            # Khung đang giải thì xoá kết quả cũ (maze có thể đã đổi)
+            if jobs.solving("left") and (dij_scan or dij_path):
+                dij_path, dij_scan, dij_total_time, dij_solver = [], [], 0, None
+            if jobs.solving("right") and (ast_scan or ast_path):
+                ast_path, ast_scan, ast_total_time, ast_solver = [], [], 0, None
+
+            for side, (path, explored, elapsed, solver_stats) in jobs.poll():
+                if side == "left":
+                    dij_path, dij_scan = path or [], explored
+                    dij_total_time, dij_solver = elapsed, solver_stats
+                    dij_i = dij_scan_t = 0
+                    dij_scan_i = len(dij_scan) if skip_scan else 0
+                else:
+                    ast_path, ast_scan = path or [], explored
+                    ast_total_time, ast_solver = elapsed, solver_stats
+                    ast_i = ast_scan_t = 0
+                    ast_scan_i = len(ast_scan) if skip_scan else 0
+
+            scan_done = False
 
         # ===============================
         # SCAN + MOVE UPDATE
@@ -616,7 +1488,8 @@ def main():
                 ast_scan_i += 1
                 ast_scan_t = 0
 
-            if dij_scan_i >= len(dij_scan) and ast_scan_i >= len(ast_scan):
+            if (dij_scan_i >= len(dij_scan) and ast_scan_i >= len(ast_scan)
+                    and not jobs.solving()):
                 scan_done = True
 
         # ======= ROBOT MOVEMENT WITH GLOBAL SPEED =======
@@ -644,37 +1517,48 @@ def main():
 
         mode = btn_mode.current
 
-        dij_stats_cur = get_progress_stats(dij_path, dij_scan, dij_i, dij_scan_i, dij_total_time)
-        ast_stats_cur = get_progress_stats(ast_path, ast_scan, ast_i, ast_scan_i, ast_total_time)
-
-        draw_hud(screen, MOVE_DELAY, PAUSED, mode,
-                 dij_stats_cur, ast_stats_cur,
-                 left_ox, right_ox, maze_w)
+        dij_stats_cur = get_progress_stats(dij_path, dij_scan, dij_i, dij_scan_i,
+                                           dij_total_time, dij_solver)
+        ast_stats_cur = get_progress_stats(ast_path, ast_scan, ast_i, ast_scan_i,
+                                           ast_total_time, ast_solver)
 
 
         # Frame separator
         pygame.draw.rect(screen, (70, 70, 100),
-                         (PADDING + MAZE_FRAME_W, left_oy, GAP, MAZE_FRAME_H))
+                         (PADDING + MAZE_FRAME_W, TOP_RESERVED, GAP, MAZE_FRAME_H))
+
+        # Camera bám robot (phím F)
+        for cam, path, i in ((left_cam, dij_path, dij_i), (right_cam, ast_path, ast_i)):
+            if cam.follow and scan_done and i < len(path) and cam.scale > cam.fit_scale:
+                cam.center_on(path[i])
 
         # Left maze
-        if mode in ["Dijkstra", "Compare"]:
-            draw_maze(screen, maze, start, goal, left_ox, left_oy)
-            draw_radar(screen, dij_scan, left_ox, left_oy, DIJ_RADAR_COLOR, dij_scan_i)
-            if scan_done:
-                draw_path(screen, dij_path, left_ox, left_oy, DIJ_PATH_COLOR)
-                draw_robot(screen, dij_path, dij_i, left_ox, left_oy, DIJ_PATH_COLOR)
-
-
-        if mode in ["A*", "Compare"]:
-            draw_maze(screen, maze, start, goal, right_ox, right_oy)
-            draw_radar(screen, ast_scan, right_ox, right_oy, AST_RADAR_COLOR, ast_scan_i)
-            if scan_done:
-                draw_path(screen, ast_path, right_ox, right_oy, AST_PATH_COLOR)
-                draw_robot(screen, ast_path, ast_i, right_ox, right_oy, AST_PATH_COLOR)
-    
+        if mode in LEFT_PANEL_MODES:
+            draw_panel(screen, left_cam, mg, dij_layer, dij_radar, dij_raster,
+                       dij_scan, dij_scan_i, dij_path, dij_i, scan_done, DIJ_PATH_COLOR)
+
+        if mode in RIGHT_PANEL_MODES:
+            draw_panel(screen, right_cam, mg, ast_layer, ast_radar, ast_raster,
+                       ast_scan, ast_scan_i, ast_path, ast_i, scan_done, AST_PATH_COLOR)
+
+        # HUD vẽ sau cùng để khung đã zoom không che thẻ thống kê
+        draw_hud(screen, MOVE_DELAY, PAUSED, mode,
+                 dij_stats_cur, ast_stats_cur,
+                 left_ox, right_ox, maze_w, repair, jobs.jobs, frame_time, len(pending_cells))
+
+        if show_debug:
+            draw_debug(screen, TEXT_CACHE,
+                       TEXT_CACHE.hits - hits0, TEXT_CACHE.misses - misses0,
+                       (dij_layer, ast_layer))
+
+
+        # Không tính thời gian chờ của clock.tick()
+        spent = time.perf_counter() - frame_t0
+        frame_time = spent if frame_time is None else 0.9 * frame_time + 0.1 * spent
 
         pygame.display.flip()
 
+    jobs.shutdown()
     pygame.quit()
 
 
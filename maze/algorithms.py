@@ -1,4 +1,16 @@
 import heapq
+import time
+from array import array
+
+import numpy as np
+
+from maze.maze_generator import DIRECTIONS, NEIGHBOR_OFFSETS, UP, DOWN, LEFT, RIGHT
+
+
+def neighbor_bits(maze):
+    """Flat view of maze.neighbor_mask(), indexed by row * maze.width + col"""
+    return memoryview(np.ascontiguousarray(maze.neighbor_mask()).reshape(-1))
+
 
 def reconstruct_path(came_from, start, goal):
     if goal not in came_from:
@@ -16,9 +28,24 @@ def reconstruct_path(came_from, start, goal):
 # ----------------------------------------------------------
 # DIJKSTRA CÓ TRACK QUÁ TRÌNH QUÉT
 # ----------------------------------------------------------
-def dijkstra(maze):
+def dijkstra(maze, stats=None):
+    """
+    Shortest path from maze.start to maze.goal. Uniform-cost mazes go
+    through bfs(), which gives the same result without heap operations.
+    """
+    if getattr(maze, "uniform_cost", True):
+        return bfs(maze, stats)
+    return dijkstra_heap(maze, stats)
+
+
+def dijkstra_heap(maze, stats=None):
+    if stats is not None:
+        return _heap_search_stats(maze, stats, _no_heuristic)
+
     start = maze.start
     goal = maze.goal
+    bits = neighbor_bits(maze)
+    width = maze.width
 
     pq = [(0, start)]
     dist = {start: 0}
@@ -37,7 +64,9 @@ def dijkstra(maze):
         if current == goal:
             break
 
-        for nb in maze.get_neighbors(current):
+        r, c = current
+        for dr, dc in NEIGHBOR_OFFSETS[bits[r * width + c]]:
+            nb = (r + dr, c + dc)
             new_cost = cost + 1
             if new_cost < dist.get(nb, float("inf")):
                 dist[nb] = new_cost
@@ -47,6 +76,148 @@ def dijkstra(maze):
     return reconstruct_path(came_from, start, goal), dist.get(goal, float("inf")), explored
 
 
+def bfs(maze, stats=None):
+    """
+    Unit-cost Dijkstra without a heap. Each distance level is expanded in
+    (row, col) order, which is exactly the heap's pop order, so path, cost
+    and explored match dijkstra_heap().
+    """
+    if stats is not None:
+        return _bfs_stats(maze, stats)
+
+    width = maze.width
+    n = maze.height * width
+    bits = neighbor_bits(maze)
+    steps = flat_steps(width)
+    start = maze.start[0] * width + maze.start[1]
+    goal = maze.goal[0] * width + maze.goal[1]
+
+    parent = array("i", [-1]) * n
+    seen = bytearray(n)
+    explored = []
+
+    seen[start] = 1
+    frontier = [start]
+    level = 0
+    found = False
+
+    while frontier and not found:
+        frontier.sort()
+        next_frontier = []
+
+        for current in frontier:
+            explored.append(current)
+            if current == goal:
+                found = True
+                break
+
+            for step in steps[bits[current]]:
+                nb = current + step
+                if not seen[nb]:
+                    seen[nb] = 1
+                    parent[nb] = current
+                    next_frontier.append(nb)
+
+        if not found:
+            frontier = next_frontier
+            level += 1
+
+    cost = level if found else float("inf")
+    explored = [divmod(i, width) for i in explored]
+    return reconstruct_flat_path(parent, start, goal, width), cost, explored
+
+
+# ----------------------------------------------------------
+# TRƯỜNG KHOẢNG CÁCH (WAVEFRONT) CHO TOÀN BỘ LƯỚI
+# ----------------------------------------------------------
+def distance_field(maze, source=None, target=None):
+    """
+    Moves from source (default maze.goal) to every open cell, as an int32
+    array shaped like maze.maze; -1 marks walls and unreachable cells.
+    The wavefront grows one level per step with array ops on the frontier,
+    no per-cell Python loop. With a target, stops once it is reached.
+    """
+    if source is None:
+        source = maze.goal
+    width = maze.width
+    dist = np.full(maze.height * width, -1, dtype=np.int32)
+    if maze.maze[source[0], source[1]] != 0:
+        return dist.reshape(maze.height, width)
+
+    mask = np.ascontiguousarray(maze.neighbor_mask()).reshape(-1)
+    steps = [(bit, dr * width + dc) for bit, dr, dc in DIRECTIONS]
+    target_id = -1 if target is None else target[0] * width + target[1]
+
+    frontier = np.array([source[0] * width + source[1]], dtype=np.intp)
+    dist[frontier] = 0
+    level = 0
+
+    while frontier.size and (target_id < 0 or dist[target_id] < 0):
+        level += 1
+        bits = mask[frontier]
+        nxt = np.concatenate([frontier[(bits & bit) != 0] + step for bit, step in steps])
+        nxt = np.unique(nxt[dist[nxt] < 0])
+        dist[nxt] = level
+        frontier = nxt
+
+    return dist.reshape(maze.height, width)
+
+
+def path_from_field(field, start):
+    """Walk down the distance field from start to its source (None if unreachable)"""
+    r, c = start
+    d = int(field[r, c])
+    if d < 0:
+        return None
+
+    rows, cols = field.shape
+    path = [(r, c)]
+    while d > 0:
+        for _, dr, dc in DIRECTIONS:
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < rows and 0 <= nc < cols and field[nr, nc] == d - 1:
+                r, c = nr, nc
+                break
+        d -= 1
+        path.append((r, c))
+
+    return path
+
+
+class GoalDistanceCache:
+    """
+    Answers many start -> goal queries on one maze from a single reverse
+    distance field. The field is rebuilt only when maze.revision changes
+    (generate_maze, set_wall, invalidate_neighbors).
+    """
+
+    def __init__(self, maze, goal=None):
+        self.maze = maze
+        self.goal = goal  # None = follow maze.goal
+        self.hits = 0
+        self.misses = 0
+        self._field = None
+        self._key = None
+
+    def field(self):
+        goal = self.goal if self.goal is not None else self.maze.goal
+        key = (self.maze.revision, goal)
+        if self._field is None or self._key != key:
+            self.misses += 1
+            self._field = distance_field(self.maze, goal)
+            self._key = key
+        else:
+            self.hits += 1
+        return self._field
+
+    def distance_from(self, start):
+        d = int(self.field()[start[0], start[1]])
+        return d if d >= 0 else float("inf")
+
+    def path_from(self, start):
+        return path_from_field(self.field(), start)
+
+
 # ----------------------------------------------------------
 # A* CÓ TRACK QUÁ TRÌNH QUÉT
 # ----------------------------------------------------------
@@ -54,9 +225,14 @@ def heuristic(a, b):
     return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
 
-def astar(maze):
+def astar(maze, stats=None):
+    if stats is not None:
+        return _heap_search_stats(maze, stats, heuristic)
+
     start = maze.start
     goal = maze.goal
+    bits = neighbor_bits(maze)
+    width = maze.width
 
     open_list = [(heuristic(start, goal), 0, start)]
     came_from = {}
@@ -75,7 +251,9 @@ def astar(maze):
         if current == goal:
             break
 
-        for nb in maze.get_neighbors(current):
+        r, c = current
+        for dr, dc in NEIGHBOR_OFFSETS[bits[r * width + c]]:
+            nb = (r + dr, c + dc)
             new_g = g[current] + 1
 
             if new_g < g.get(nb, float("inf")):
@@ -85,3 +263,513 @@ def astar(maze):
                 heapq.heappush(open_list, (f_new, new_g, nb))
 
     return reconstruct_path(came_from, start, goal), g.get(goal, float("inf")), explored
+
+
+
+# ----------------------------------------------------------
+# SỐ LIỆU ĐO (OPT-IN): truyền stats={} cho dijkstra/bfs/astar
+# ----------------------------------------------------------
+# Bản đo là vòng lặp riêng, nên bản thường không tốn thêm lệnh nào.
+# heap_pushes/heap_pops: thao tác trên open list (với bfs là hàng đợi theo tầng)
+# stale_pops: lần pop ô đã đóng; relaxations: lần cập nhật dist/g thành công
+# peak_open: kích thước open list lớn nhất; max_dist: số khoá lớn nhất của dist/g
+# neighbor_time: tổng thời gian (giây) sinh danh sách ô kề
+STATS_KEYS = (
+    "heap_pushes", "heap_pops", "stale_pops", "relaxations",
+    "peak_open", "max_dist", "neighbor_time",
+)
+
+
+def _no_heuristic(a, b):
+    return 0
+
+
+def _bfs_stats(maze, stats):
+    width = maze.width
+    n = maze.height * width
+    bits = neighbor_bits(maze)
+    steps = flat_steps(width)
+    start = maze.start[0] * width + maze.start[1]
+    goal = maze.goal[0] * width + maze.goal[1]
+    clock = time.perf_counter
+
+    parent = array("i", [-1]) * n
+    seen = bytearray(n)
+    explored = []
+    pushes, pops, relax, peak, nb_time = 1, 0, 0, 1, 0.0
+
+    seen[start] = 1
+    frontier = [start]
+    level = 0
+    found = False
+
+    while frontier and not found:
+        frontier.sort()
+        next_frontier = []
+        remaining = len(frontier)
+
+        for current in frontier:
+            pops += 1
+            remaining -= 1
+            explored.append(current)
+            if current == goal:
+                found = True
+                break
+
+            t0 = clock()
+            neighbors = [current + step for step in steps[bits[current]]]
+            nb_time += clock() - t0
+
+            for nb in neighbors:
+                if not seen[nb]:
+                    seen[nb] = 1
+                    parent[nb] = current
+                    next_frontier.append(nb)
+                    pushes += 1
+                    relax += 1
+            if remaining + len(next_frontier) > peak:
+                peak = remaining + len(next_frontier)
+
+        if not found:
+            frontier = next_frontier
+            level += 1
+
+    # ô đã thấy = các ô có dist; bfs không bao giờ pop ô cũ
+    stats.update(heap_pushes=pushes, heap_pops=pops, stale_pops=0, relaxations=relax,
+                 peak_open=peak, max_dist=relax + 1, neighbor_time=nb_time)
+    cost = level if found else float("inf")
+    explored = [divmod(i, width) for i in explored]
+    return reconstruct_flat_path(parent, start, goal, width), cost, explored
+
+
+def _heap_search_stats(maze, stats, h):
+    """
+    Instrumented dijkstra_heap() (h = 0) and astar() (h = heuristic). With
+    h = 0 the (f, g, cell) entries pop in the same order as (cost, cell).
+    """
+    start = maze.start
+    goal = maze.goal
+    bits = neighbor_bits(maze)
+    width = maze.width
+    clock = time.perf_counter
+
+    open_list = [(h(start, goal), 0, start)]
+    came_from = {}
+    g = {start: 0}
+    closed = set()
+    explored = []
+    pushes, pops, stale, relax, peak, nb_time = 1, 0, 0, 0, 1, 0.0
+
+    while open_list:
+        f, cost, current = heapq.heappop(open_list)
+        pops += 1
+
+        if current in closed:
+            stale += 1
+            continue
+        closed.add(current)
+        explored.append(current)
+
+        if current == goal:
+            break
+
+        t0 = clock()
+        r, c = current
+        neighbors = [(r + dr, c + dc) for dr, dc in NEIGHBOR_OFFSETS[bits[r * width + c]]]
+        nb_time += clock() - t0
+
+        for nb in neighbors:
+            new_g = g[current] + 1
+
+            if new_g < g.get(nb, float("inf")):
+                g[nb] = new_g
+                came_from[nb] = current
+                f_new = new_g + h(nb, goal)
+                heapq.heappush(open_list, (f_new, new_g, nb))
+                pushes += 1
+                relax += 1
+        if len(open_list) > peak:
+            peak = len(open_list)
+
+    stats.update(heap_pushes=pushes, heap_pops=pops, stale_pops=stale, relaxations=relax,
+                 peak_open=peak, max_dist=len(g), neighbor_time=nb_time)
+    return reconstruct_path(came_from, start, goal), g.get(goal, float("inf")), explored
+
+
+def solve_with_stats(solver, maze):
+    """Run an instrumented solver; returns (path, cost, explored, stats)"""
+    stats = {}
+    path, cost, explored = solver(maze, stats=stats)
+    return path, cost, explored, stats
+
+
+def check_stats_variants(maze):
+    """
+    Raise AssertionError unless every instrumented loop returns the same
+    (path, cost, explored) as its plain twin and fills all STATS_KEYS.
+    The bodies are kept as separate copies for speed, so run this after
+    changing either side (benchmarks.suite does it for every maze).
+    """
+    for solver in (dijkstra_heap, bfs, astar):
+        plain = solver(maze)
+        path, cost, explored, stats = solve_with_stats(solver, maze)
+        if (path, cost, explored) != plain:
+            raise AssertionError(f"{solver.__name__}: stats variant disagrees with the plain loop")
+        missing = set(STATS_KEYS) - stats.keys()
+        if missing:
+            raise AssertionError(f"{solver.__name__}: stats missing {sorted(missing)}")
+
+
+# ----------------------------------------------------------
+# ENGINE PHẲNG: ô được đánh số r * width + c
+# ----------------------------------------------------------
+def flat_steps(width):
+    """FLAT_STEPS[mask] -> flat-id offsets of the open neighbors for this width"""
+    return tuple(
+        tuple(dr * width + dc for dr, dc in offsets)
+        for offsets in NEIGHBOR_OFFSETS
+    )
+
+
+def reconstruct_flat_path(parent, start, goal, width):
+    if goal != start and parent[goal] == -1:
+        return None
+
+    path = [divmod(goal, width)]
+    cur = goal
+    while cur != start:
+        cur = parent[cur]
+        path.append(divmod(cur, width))
+
+    return list(reversed(path))
+
+
+def dijkstra_flat(maze):
+    """
+    Same result as dijkstra(), but keyed by flat cell id with preallocated
+    int32 dist/parent buffers and a bytearray closed set instead of dicts.
+    """
+    width = maze.width
+    n = maze.height * width
+    bits = neighbor_bits(maze)
+    steps = flat_steps(width)
+    start = maze.start[0] * width + maze.start[1]
+    goal = maze.goal[0] * width + maze.goal[1]
+
+    dist = array("i", [-1]) * n      # -1 = chưa tới
+    parent = array("i", [-1]) * n
+    closed = bytearray(n)
+    explored = []
+
+    dist[start] = 0
+    pq = [(0, start)]
+
+    while pq:
+        cost, current = heapq.heappop(pq)
+
+        if closed[current]:
+            continue
+        closed[current] = 1
+        explored.append(current)
+
+        if current == goal:
+            break
+
+        new_cost = cost + 1
+        for step in steps[bits[current]]:
+            nb = current + step
+            d = dist[nb]
+            if d == -1 or new_cost < d:
+                dist[nb] = new_cost
+                parent[nb] = current
+                heapq.heappush(pq, (new_cost, nb))
+
+    cost = dist[goal] if dist[goal] != -1 else float("inf")
+    explored = [divmod(i, width) for i in explored]
+    return reconstruct_flat_path(parent, start, goal, width), cost, explored
+
+
+def astar_flat(maze):
+    """Flat-id counterpart of astar(); same path, cost and expansion order"""
+    width = maze.width
+    n = maze.height * width
+    bits = neighbor_bits(maze)
+    steps = flat_steps(width)
+    start = maze.start[0] * width + maze.start[1]
+    goal = maze.goal[0] * width + maze.goal[1]
+    goal_r, goal_c = maze.goal
+
+    g = array("i", [-1]) * n
+    parent = array("i", [-1]) * n
+    closed = bytearray(n)
+    explored = []
+
+    g[start] = 0
+    open_list = [(heuristic(maze.start, maze.goal), 0, start)]
+
+    while open_list:
+        f, cost, current = heapq.heappop(open_list)
+
+        if closed[current]:
+            continue
+        closed[current] = 1
+        explored.append(current)
+
+        if current == goal:
+            break
+
+        new_g = g[current] + 1
+        for step in steps[bits[current]]:
+            nb = current + step
+            old = g[nb]
+            if old == -1 or new_g < old:
+                g[nb] = new_g
+                parent[nb] = current
+                r, c = divmod(nb, width)
+                f_new = new_g + abs(r - goal_r) + abs(c - goal_c)
+                heapq.heappush(open_list, (f_new, new_g, nb))
+
+    cost = g[goal] if g[goal] != -1 else float("inf")
+    explored = [divmod(i, width) for i in explored]
+    return reconstruct_flat_path(parent, start, goal, width), cost, explored
+
+
+# ----------------------------------------------------------
+# TÌM KIẾM HAI CHIỀU (START <-> GOAL)
+# ----------------------------------------------------------
+FORWARD, BACKWARD = 0, 1  # tag thứ 3 của mỗi ô trong explored
+
+
+def join_flat_paths(parent_fwd, parent_bwd, start, goal, a, b, width):
+    """start..a from the forward tree + b..goal from the backward tree (a, b adjacent)"""
+    head = reconstruct_flat_path(parent_fwd, start, a, width)
+    tail = reconstruct_flat_path(parent_bwd, goal, b, width)
+    return head + list(reversed(tail))
+
+
+def bidirectional_bfs(maze):
+    """
+    BFS from start and goal together, growing the smaller frontier by one
+    full level at a time. The search stops after the first level in which
+    the two sides touch; the cheapest contact of that level is optimal.
+    explored holds (row, col, FORWARD or BACKWARD) in expansion order.
+    """
+    width = maze.width
+    n = maze.height * width
+    bits = neighbor_bits(maze)
+    steps = flat_steps(width)
+    start = maze.start[0] * width + maze.start[1]
+    goal = maze.goal[0] * width + maze.goal[1]
+
+    if start == goal:
+        return [maze.start], 0, [(*maze.start, FORWARD)]
+
+    dist = (array("i", [-1]) * n, array("i", [-1]) * n)
+    parent = (array("i", [-1]) * n, array("i", [-1]) * n)
+    frontier = [[start], [goal]]
+    dist[FORWARD][start] = 0
+    dist[BACKWARD][goal] = 0
+    explored = []
+    best = None  # (cost, ô phía start, ô phía goal)
+
+    while frontier[FORWARD] and frontier[BACKWARD] and best is None:
+        side = FORWARD if len(frontier[FORWARD]) <= len(frontier[BACKWARD]) else BACKWARD
+        mine, other, par = dist[side], dist[1 - side], parent[side]
+        next_frontier = []
+
+        for current in sorted(frontier[side]):
+            explored.append((*divmod(current, width), side))
+            new_d = mine[current] + 1
+
+            for step in steps[bits[current]]:
+                nb = current + step
+                if mine[nb] == -1:
+                    mine[nb] = new_d
+                    par[nb] = current
+                    next_frontier.append(nb)
+                if other[nb] != -1:
+                    cost = new_d + other[nb]
+                    if best is None or cost < best[0]:
+                        best = (cost, current, nb) if side == FORWARD else (cost, nb, current)
+
+        frontier[side] = next_frontier
+
+    if best is None:
+        return None, float("inf"), explored
+
+    cost, a, b = best
+    return join_flat_paths(parent[FORWARD], parent[BACKWARD], start, goal, a, b, width), cost, explored
+
+
+def bidirectional_astar(maze):
+    """
+    A* from both ends (each side aims at the other end with the Manhattan
+    heuristic). Stops once the best meeting found so far costs no more than
+    the larger of the two smallest open f values, which proves it optimal.
+    explored holds (row, col, FORWARD or BACKWARD) in expansion order.
+    """
+    width = maze.width
+    n = maze.height * width
+    bits = neighbor_bits(maze)
+    steps = flat_steps(width)
+    start = maze.start[0] * width + maze.start[1]
+    goal = maze.goal[0] * width + maze.goal[1]
+
+    if start == goal:
+        return [maze.start], 0, [(*maze.start, FORWARD)]
+
+    targets = (maze.goal, maze.start)
+    g = (array("i", [-1]) * n, array("i", [-1]) * n)
+    parent = (array("i", [-1]) * n, array("i", [-1]) * n)
+    closed = (bytearray(n), bytearray(n))
+    h0 = heuristic(maze.start, maze.goal)
+    open_lists = ([(h0, 0, start)], [(h0, 0, goal)])
+    g[FORWARD][start] = 0
+    g[BACKWARD][goal] = 0
+    explored = []
+    best = None  # (cost, ô phía start, ô phía goal)
+
+    while open_lists[FORWARD] and open_lists[BACKWARD]:
+        if best is not None and best[0] <= max(open_lists[FORWARD][0][0], open_lists[BACKWARD][0][0]):
+            break
+
+        side = FORWARD if len(open_lists[FORWARD]) <= len(open_lists[BACKWARD]) else BACKWARD
+        f, cost, current = heapq.heappop(open_lists[side])
+
+        if closed[side][current]:
+            continue
+        closed[side][current] = 1
+        explored.append((*divmod(current, width), side))
+
+        mine, other, par = g[side], g[1 - side], parent[side]
+        target_r, target_c = targets[side]
+        new_g = mine[current] + 1
+
+        for step in steps[bits[current]]:
+            nb = current + step
+            old = mine[nb]
+            if old == -1 or new_g < old:
+                mine[nb] = new_g
+                par[nb] = current
+                r, c = divmod(nb, width)
+                f_new = new_g + abs(r - target_r) + abs(c - target_c)
+                heapq.heappush(open_lists[side], (f_new, new_g, nb))
+            if other[nb] != -1:
+                total = new_g + other[nb]
+                if best is None or total < best[0]:
+                    best = (total, current, nb) if side == FORWARD else (total, nb, current)
+
+    if best is None:
+        return None, float("inf"), explored
+
+    cost, a, b = best
+    return join_flat_paths(parent[FORWARD], parent[BACKWARD], start, goal, a, b, width), cost, explored
+
+
+# ----------------------------------------------------------
+# JUMP POINT SEARCH (LƯỚI 4 HƯỚNG)
+# ----------------------------------------------------------
+OPPOSITE = {UP: DOWN, DOWN: UP, LEFT: RIGHT, RIGHT: LEFT}
+PERPENDICULAR = {UP: LEFT | RIGHT, DOWN: LEFT | RIGHT, LEFT: UP | DOWN, RIGHT: UP | DOWN}
+
+
+def jps(maze, stats=None):
+    """
+    A* over jump points of the 4-connected grid. From each expanded cell the
+    search runs straight until the goal, a cell with a side opening (a turn
+    or junction) or a dead end, which is pruned. Cells in between have no
+    other way out, so they are never pushed on the heap. Same return
+    contract as astar(); explored lists the jump points expanded.
+
+    If stats is a dict it is filled with "jump_points", "traversed" (cells
+    stepped over while jumping), "heap_pushes" and "heap_pops".
+    """
+    width = maze.width
+    n = maze.height * width
+    bits = neighbor_bits(maze)
+    start = maze.start[0] * width + maze.start[1]
+    goal = maze.goal[0] * width + maze.goal[1]
+    goal_r, goal_c = maze.goal
+    steps = [(bit, dr * width + dc) for bit, dr, dc in DIRECTIONS]
+
+    g = array("i", [-1]) * n
+    parent = array("i", [-1]) * n
+    arrived = bytearray(n)  # bit hướng đi vào ô, 0 = start
+    closed = bytearray(n)
+    explored = []
+    traversed = pushes = pops = 0
+
+    g[start] = 0
+    open_list = [(heuristic(maze.start, maze.goal), 0, start)]
+    pushes += 1
+
+    while open_list:
+        f, cost, current = heapq.heappop(open_list)
+        pops += 1
+
+        if closed[current]:
+            continue
+        closed[current] = 1
+        explored.append(current)
+
+        if current == goal:
+            break
+
+        back = OPPOSITE.get(arrived[current], 0)
+        for bit, step in steps:
+            if bit == back or not bits[current] & bit:
+                continue
+
+            # Nhảy thẳng theo hướng bit
+            side = PERPENDICULAR[bit]
+            jp = current
+            length = 0
+            while True:
+                jp += step
+                length += 1
+                m = bits[jp]
+                if jp == goal or m & side:
+                    break
+                if not m & bit:
+                    jp = -1  # ngõ cụt: bỏ cả đoạn
+                    break
+            traversed += length
+            if jp == -1:
+                continue
+
+            new_g = cost + length
+            old = g[jp]
+            if old == -1 or new_g < old:
+                g[jp] = new_g
+                parent[jp] = current
+                arrived[jp] = bit
+                r, c = divmod(jp, width)
+                heapq.heappush(open_list, (new_g + abs(r - goal_r) + abs(c - goal_c), new_g, jp))
+                pushes += 1
+
+    if stats is not None:
+        stats["jump_points"] = len(explored)
+        stats["traversed"] = traversed
+        stats["heap_pushes"] = pushes
+        stats["heap_pops"] = pops
+
+    explored = [divmod(i, width) for i in explored]
+    if goal != start and parent[goal] == -1:
+        return None, float("inf"), explored
+    return expand_jump_path(parent, start, goal, width), g[goal], explored
+
+
+def expand_jump_path(parent, start, goal, width):
+    """Fill in the straight runs between consecutive jump points"""
+    points = [goal]
+    while points[-1] != start:
+        points.append(parent[points[-1]])
+    points.reverse()
+
+    path = [divmod(start, width)]
+    for a, b in zip(points, points[1:]):
+        step = width if abs(b - a) >= width else 1
+        step = step if b > a else -step
+        for cell in range(a + step, b + step, step):
+            path.append(divmod(cell, width))
+    return path
@@ -0,0 +1,116 @@
+"""
+Batch solving over a process pool, streaming one JSON line per maze.
+
+    python -m maze.batch --count 1000 --size 501 --algorithm astar --workers 32
+    python -m maze.batch --files mazes/*.maze --algorithm jps > results.jsonl
+
+Generated mazes are built inside the workers from their seed and files are
+memory-mapped there, so only small task/result tuples cross processes.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from maze.maze_generator import GENERATORS, MazeGenerator
+from maze.solvers import SOLVERS
+
+
+def solve_task(task):
+    """Generate or load one maze and solve it; runs in a worker process"""
+    kind, source, algorithm, options = task
+
+    t0 = time.perf_counter()
+    if kind == "file":
+        mg = MazeGenerator.load(source)
+    else:
+        mg = MazeGenerator(options["width"], options["height"],
+                           algorithm=options["generator"], seed=source)
+        mg.generate_maze()
+    t1 = time.perf_counter()
+    path, cost, explored = SOLVERS[algorithm](mg)
+    t2 = time.perf_counter()
+
+    return {
+        kind: source,
+        "width": mg.width,
+        "height": mg.height,
+        "algorithm": algorithm,
+        "path_len": len(path) if path else 0,
+        "cost": cost if path else None,
+        "expanded": len(explored),
+        "prepare_ms": round((t1 - t0) * 1000, 3),
+        "solve_ms": round((t2 - t1) * 1000, 3),
+        "pid": os.getpid(),
+    }
+
+
+def iter_tasks(args):
+    options = {"width": args.width or args.size, "height": args.height or args.size,
+               "generator": args.generator}
+    if args.files:
+        for path in args.files:
+            yield "file", path, args.algorithm, options
+    else:
+        for seed in range(args.seed, args.seed + args.count):
+            yield "seed", seed, args.algorithm, options
+
+
+def run_batch(tasks, workers, window=4):
+    """
+    Yield results as they finish. At most workers * window tasks are in
+    flight, so an arbitrarily long task stream never piles up futures.
+    """
+    tasks = iter(tasks)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for task in tasks:
+            pending.add(pool.submit(solve_task, task))
+            if len(pending) >= workers * window:
+                break
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+            for task in tasks:
+                pending.add(pool.submit(solve_task, task))
+                if len(pending) >= workers * window:
+                    break
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", nargs="+", help="maze files written by MazeGenerator.save()")
+    parser.add_argument("--count", type=int, default=100, help="mazes to generate (ignored with --files)")
+    parser.add_argument("--seed", type=int, default=0, help="first seed; maze i uses seed + i")
+    parser.add_argument("--size", type=int, default=101)
+    parser.add_argument("--width", type=int)
+    parser.add_argument("--height", type=int)
+    parser.add_argument("--generator", default="dfs", choices=GENERATORS)
+    parser.add_argument("--algorithm", default="dijkstra", choices=list(SOLVERS))
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--output", help="write JSON lines here instead of stdout")
+    args = parser.parse_args()
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    t0 = time.perf_counter()
+    n = 0
+    try:
+        for result in run_batch(iter_tasks(args), args.workers):
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+            n += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - t0
+    print(f"{n} mazes in {elapsed:.2f} s ({n / elapsed:.1f} mazes/s, {args.workers} workers)",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
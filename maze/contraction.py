@@ -0,0 +1,156 @@
+import heapq
+import weakref
+
+import numpy as np
+
+from maze.algorithms import OPPOSITE, heuristic, neighbor_bits
+from maze.maze_generator import DIRECTIONS, POPCOUNT
+
+
+class JunctionGraph:
+    """
+    Maze compiled to a weighted graph: nodes are junctions, dead ends, start
+    and goal; each corridor of degree-2 cells between them becomes one edge
+    weighted by its length. Dead-end branches holding neither start nor goal
+    are pruned. Paths found here are expanded back to cell level.
+    """
+
+    def __init__(self, maze):
+        self.width = width = maze.width
+        self.start = maze.start[0] * width + maze.start[1]
+        self.goal = maze.goal[0] * width + maze.goal[1]
+        self.revision = maze.revision
+        self.bits = bits = neighbor_bits(maze)
+        self.steps = {bit: dr * width + dc for bit, dr, dc in DIRECTIONS}
+
+        # Ô là node nếu mở và có bậc khác 2 (ngã rẽ, ngõ cụt), cộng start/goal
+        mask = maze.neighbor_mask()
+        is_node = (maze.maze == 0) & (POPCOUNT[mask] != 2)
+        is_node[maze.start] = True
+        is_node[maze.goal] = True
+        self.is_node = bytearray(is_node.reshape(-1).tobytes())
+
+        # adjacency[u] = [(v, độ dài, bit hướng ra khỏi u), ...]
+        self.adjacency = {}
+        for u in np.flatnonzero(is_node).tolist():
+            edges = []
+            for bit, step in self.steps.items():
+                if bits[u] & bit:
+                    v, length = self._walk(u, bit)
+                    if v != u:
+                        edges.append((v, length, bit))
+            self.adjacency[u] = edges
+
+        self.cells = int((maze.maze == 0).sum())
+        self.pruned = self._prune_dead_ends()
+
+    def _walk(self, u, bit):
+        """Follow the corridor leaving u by bit; return (node reached, length)"""
+        cells = self.expand_edge(u, bit)
+        return cells[-1], len(cells)
+
+    def _prune_dead_ends(self):
+        """Drop leaves (other than start/goal) repeatedly; return how many went"""
+        keep = (self.start, self.goal)
+        leaves = [u for u, edges in self.adjacency.items() if len(edges) <= 1 and u not in keep]
+        pruned = 0
+        while leaves:
+            u = leaves.pop()
+            edges = self.adjacency.pop(u, None)
+            if edges is None:
+                continue
+            pruned += 1
+            for v, _, _ in edges:
+                others = [e for e in self.adjacency[v] if e[0] != u]
+                self.adjacency[v] = others
+                if len(others) <= 1 and v not in keep:
+                    leaves.append(v)
+        return pruned
+
+    @property
+    def node_count(self):
+        return len(self.adjacency)
+
+    @property
+    def edge_count(self):
+        return sum(len(edges) for edges in self.adjacency.values()) // 2
+
+    def expand_edge(self, u, bit):
+        """Cells after u along the corridor leaving by bit, up to the next node"""
+        cells = []
+        cur = u + self.steps[bit]
+        came = OPPOSITE[bit]
+        cells.append(cur)
+        while not self.is_node[cur]:
+            for b, step in self.steps.items():
+                if b != came and self.bits[cur] & b:
+                    cur += step
+                    came = OPPOSITE[b]
+                    break
+            cells.append(cur)
+        return cells
+
+    def search(self):
+        """A* on the junction graph; returns (path, cost, explored) like astar()"""
+        width = self.width
+        start, goal = self.start, self.goal
+        goal_cell = divmod(goal, width)
+
+        g = {start: 0}
+        came_from = {}  # node -> (node trước, bit hướng ra)
+        closed = set()
+        explored = []
+        open_list = [(heuristic(divmod(start, width), goal_cell), 0, start)]
+
+        while open_list:
+            f, cost, current = heapq.heappop(open_list)
+
+            if current in closed:
+                continue
+            closed.add(current)
+            explored.append(divmod(current, width))
+
+            if current == goal:
+                break
+
+            for nb, length, bit in self.adjacency.get(current, ()):
+                new_g = cost + length
+                if new_g < g.get(nb, float("inf")):
+                    g[nb] = new_g
+                    came_from[nb] = (current, bit)
+                    f_new = new_g + heuristic(divmod(nb, width), goal_cell)
+                    heapq.heappush(open_list, (f_new, new_g, nb))
+
+        if goal != start and goal not in came_from:
+            return None, float("inf"), explored
+
+        hops = []
+        cur = goal
+        while cur != start:
+            prev, bit = came_from[cur]
+            hops.append((prev, bit))
+            cur = prev
+
+        path = [divmod(start, width)]
+        for u, bit in reversed(hops):
+            path.extend(divmod(cell, width) for cell in self.expand_edge(u, bit))
+        return path, g[goal], explored
+
+
+_graphs = weakref.WeakKeyDictionary()
+
+
+def junction_graph(maze):
+    """JunctionGraph of maze, rebuilt only when the grid, start or goal change"""
+    graph = _graphs.get(maze)
+    width = maze.width
+    if (graph is None or graph.revision != maze.revision
+            or graph.start != maze.start[0] * width + maze.start[1]
+            or graph.goal != maze.goal[0] * width + maze.goal[1]):
+        graph = _graphs[maze] = JunctionGraph(maze)
+    return graph
+
+
+def contracted_astar(maze):
+    """A* on the cached junction graph; explored lists the nodes expanded"""
+    return junction_graph(maze).search()
@@ -0,0 +1,144 @@
+import random
+
+import numpy as np
+
+from maze.maze_generator import MazeGenerator, check_seed, pack_header
+
+
+class EllerMazeGenerator:
+    """
+    Streaming maze generator (Eller's algorithm). Rows are produced top to
+    bottom keeping only O(width) state, so the grid never has to fit in
+    memory: bands can be written straight into an np.memmap.
+
+    Layout matches MazeGenerator (odd size, cells at odd coordinates,
+    1 = wall). With loop_fraction=0 the result is a perfect maze; otherwise
+    each dead end is connected to a neighboring path with that probability,
+    the same way MazeGenerator.connect_dead_end does it.
+    """
+
+    def __init__(self, width=21, height=21, loop_fraction=0.5, seed=None):
+        self.width = width if width % 2 == 1 else width + 1  # Ensure odd size
+        self.height = height if height % 2 == 1 else height + 1
+        self.loop_fraction = loop_fraction
+        self.seed = check_seed(seed)
+        self.start = (1, 1)
+        self.goal = (self.height - 2, self.width - 2)
+
+    def rows(self):
+        """Yield the grid one row at a time (uint8 arrays of length width)"""
+        rng = random.Random(self.seed)
+        h, w = self.height, self.width
+        ch, cw = (h - 1) // 2, (w - 1) // 2
+
+        top = bytearray(b"\x01") * w   # hàng tường phía trên hàng ô hiện tại
+        sets = [0] * cw
+        fresh = [True] * cw            # ô chưa thuộc tập nào
+        next_id = 0
+
+        for i in range(ch):
+            last = i == ch - 1
+            mid = bytearray(b"\x01") * w
+            bottom = bytearray(b"\x01") * w
+            for j in range(cw):
+                mid[2 * j + 1] = 0
+
+            # 1) Ô mới nhận tập riêng
+            for j in range(cw):
+                if fresh[j]:
+                    sets[j] = next_id
+                    next_id += 1
+            members = {}
+            for j, s in enumerate(sets):
+                members.setdefault(s, []).append(j)
+
+            # 2) Nối ngang ngẫu nhiên (hàng cuối: nối hết các tập khác nhau)
+            for j in range(cw - 1):
+                a, b = sets[j], sets[j + 1]
+                if a != b and (last or rng.random() < 0.5):
+                    mid[2 * j + 2] = 0
+                    if len(members[a]) < len(members[b]):
+                        a, b = b, a
+                    for col in members[b]:
+                        sets[col] = a
+                    members[a].extend(members.pop(b))
+
+            # 3) Mỗi tập đi xuống ít nhất một ô
+            fresh = [True] * cw
+            if not last:
+                for cols in members.values():
+                    down = [col for col in cols if rng.random() < 0.5] or [rng.choice(cols)]
+                    for col in down:
+                        bottom[2 * col + 1] = 0
+                        fresh[col] = False
+
+            if self.loop_fraction > 0:
+                self._connect_dead_ends(rng, i, top, mid, bottom)
+
+            yield np.frombuffer(bytes(top), dtype=np.uint8)
+            yield np.frombuffer(bytes(mid), dtype=np.uint8)
+            top = bottom
+
+        yield np.frombuffer(bytes(top), dtype=np.uint8)
+
+    def _connect_dead_ends(self, rng, i, top, mid, bottom):
+        """Open one wall of some dead ends in cell row i (rows still in hand)"""
+        h, w = self.height, self.width
+        r = 2 * i + 1
+        for c in range(1, w - 1, 2):
+            walls = (
+                (r - 1, top, c),     # Up
+                (r + 1, bottom, c),  # Down
+                (r, mid, c - 1),     # Left
+                (r, mid, c + 1),     # Right
+            )
+            if sum(row[col] == 0 for _, row, col in walls) != 1:
+                continue
+            if rng.random() >= self.loop_fraction:
+                continue
+            # Ô bên kia bức tường luôn là ô mở của lưới, chỉ cần tường nằm trong
+            for wr, row, col in walls:
+                if 0 < wr < h - 1 and 0 < col < w - 1 and row[col] == 1:
+                    row[col] = 0
+                    break
+
+    def bands(self, band_rows=256):
+        """Yield (first_row, band) with up to band_rows rows per band"""
+        band = []
+        first = 0
+        for r, row in enumerate(self.rows()):
+            band.append(row)
+            if len(band) == band_rows:
+                yield first, np.stack(band)
+                band = []
+                first = r + 1
+        if band:
+            yield first, np.stack(band)
+
+    def write_to(self, out, band_rows=256):
+        """Stream the maze into out (any (height, width) array, e.g. np.memmap)"""
+        for first, band in self.bands(band_rows):
+            out[first:first + len(band)] = band
+        return out
+
+    def save(self, path, band_rows=256):
+        """Stream the maze to a file readable by MazeGenerator.load()"""
+        with open(path, "wb") as f:
+            f.write(pack_header(self.height, self.width, self.start, self.goal,
+                                self.seed, "eller"))
+            for _, band in self.bands(band_rows):
+                band.tofile(f)
+
+    def generate(self):
+        return self.write_to(np.empty((self.height, self.width), dtype=np.uint8))
+
+    def as_maze(self, grid=None):
+        """MazeGenerator wrapping grid (generated now if omitted), ready for the solvers"""
+        mg = MazeGenerator(self.width, self.height, seed=self.seed)
+        mg.maze = self.generate() if grid is None else grid
+        mg.source_algorithm = "eller"  # save() ghi lại đúng nguồn của lưới
+        mg.start, mg.goal = self.start, self.goal
+        mg.invalidate_neighbors()
+        if grid is None:
+            mg.mark_grid_seed(self.seed)
+        return mg
@@ -0,0 +1,279 @@
+import heapq
+import weakref
+from collections import deque
+
+from maze.algorithms import heuristic, neighbor_bits
+from maze.maze_generator import DIRECTIONS
+
+
+class HierarchicalMap:
+    """
+    HPA*-style abstraction of a maze. The grid is cut into square clusters;
+    each run of open cell pairs across a cluster border gives one entrance
+    (a pair of abstract nodes), and distances between the entrances of a
+    cluster are precomputed. Queries search this small graph and refine it
+    to cells lazily, caching the intra-cluster pieces.
+
+    Paths are near-optimal, not guaranteed shortest: one entrance per run
+    can force a small detour.
+    """
+
+    def __init__(self, maze, cluster_size=16):
+        self.maze = maze
+        self.size = cluster_size
+        self.width = maze.width
+        self.height = maze.height
+        self.cluster_rows = -(-self.height // cluster_size)
+        self.cluster_cols = -(-self.width // cluster_size)
+        self.steps = [(bit, dr * self.width + dc) for bit, dr, dc in DIRECTIONS]
+        self.bits = neighbor_bits(maze)
+        self.revision = maze.revision
+
+        self.borders = {}  # (cụm a, cụm b) -> [(ô bên a, ô bên b), ...]
+        self.inter = {}    # node -> set các node kề bên cụm khác
+        self.intra = {}    # cụm -> {node: [(node, khoảng cách), ...]}
+        self.paths = {}    # cụm -> {(u, v): [ô...]} cache đường chi tiết
+
+        for cluster in self._all_clusters():
+            for other in self._next_clusters(cluster):
+                self._build_border(cluster, other)
+        for cluster in self._all_clusters():
+            self._build_cluster(cluster)
+
+    # ---------- cụm và biên ----------
+    def _all_clusters(self):
+        return [(i, j) for i in range(self.cluster_rows) for j in range(self.cluster_cols)]
+
+    def _next_clusters(self, cluster):
+        """Clusters below and to the right (each border is owned by the upper/left one)"""
+        i, j = cluster
+        if i + 1 < self.cluster_rows:
+            yield (i + 1, j)
+        if j + 1 < self.cluster_cols:
+            yield (i, j + 1)
+
+    def _touching(self, cluster):
+        i, j = cluster
+        for ci, cj in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)):
+            if 0 <= ci < self.cluster_rows and 0 <= cj < self.cluster_cols:
+                yield (ci, cj)
+
+    def cluster_of(self, cell):
+        r, c = divmod(cell, self.width)
+        return (r // self.size, c // self.size)
+
+    def _bounds(self, cluster):
+        i, j = cluster
+        r0, c0 = i * self.size, j * self.size
+        return r0, min(r0 + self.size, self.height), c0, min(c0 + self.size, self.width)
+
+    def _build_border(self, a, b):
+        """One transition (middle of each open run) across the border a|b"""
+        for u, v in self.borders.pop((a, b), ()):
+            self.inter[u].discard(v)
+            self.inter[v].discard(u)
+
+        r0, r1, c0, c1 = self._bounds(a)
+        grid = self.maze.maze
+        if b[0] > a[0]:   # b nằm dưới a: biên ngang
+            pairs = [((r1 - 1, c), (r1, c)) for c in range(c0, c1)]
+        else:             # b nằm phải a: biên dọc
+            pairs = [((r, c1 - 1), (r, c1)) for r in range(r0, r1)]
+
+        transitions = []
+        run = []
+        for p, q in pairs + [(None, None)]:
+            if p is not None and grid[p] == 0 and grid[q] == 0:
+                run.append((p, q))
+                continue
+            if run:
+                p_mid, q_mid = run[len(run) // 2]
+                transitions.append((p_mid[0] * self.width + p_mid[1],
+                                    q_mid[0] * self.width + q_mid[1]))
+                run = []
+
+        self.borders[(a, b)] = transitions
+        for u, v in transitions:
+            self.inter.setdefault(u, set()).add(v)
+            self.inter.setdefault(v, set()).add(u)
+
+    def _cluster_nodes(self, cluster):
+        nodes = set()
+        for other in self._touching(cluster):
+            key = (cluster, other) if other > cluster else (other, cluster)
+            for u, v in self.borders.get(key, ()):
+                nodes.add(u if other > cluster else v)
+        return sorted(nodes)
+
+    def _cluster_bfs(self, source, cluster):
+        """BFS restricted to one cluster; returns the parent dict (source -> None)"""
+        r0, r1, c0, c1 = self._bounds(cluster)
+        width = self.width
+        bits = self.bits
+        parent = {source: None}
+        queue = deque([source])
+        while queue:
+            cur = queue.popleft()
+            for bit, step in self.steps:
+                if bits[cur] & bit:
+                    nb = cur + step
+                    if nb not in parent:
+                        r, c = divmod(nb, width)
+                        if r0 <= r < r1 and c0 <= c < c1:
+                            parent[nb] = cur
+                            queue.append(nb)
+        return parent
+
+    def _build_cluster(self, cluster):
+        nodes = self._cluster_nodes(cluster)
+        edges = {}
+        for u in nodes:
+            parent = self._cluster_bfs(u, cluster)
+            edges[u] = [(v, _depth(parent, v)) for v in nodes if v != u and v in parent]
+        self.intra[cluster] = edges
+        self.paths[cluster] = {}
+
+    def update(self, cells):
+        """
+        Refresh after the given (row, col) cells changed. Only the borders of
+        the clusters holding those cells, and the clusters on both sides of
+        those borders, are rebuilt.
+        """
+        self.bits = neighbor_bits(self.maze)
+        self.revision = self.maze.revision
+        changed = {self.cluster_of(r * self.width + c) for r, c in cells}
+        rebuild = set(changed)
+        for cluster in changed:
+            for other in self._touching(cluster):
+                a, b = (cluster, other) if other > cluster else (other, cluster)
+                self._build_border(a, b)
+                rebuild.add(other)
+        for cluster in rebuild:
+            self._build_cluster(cluster)
+        return len(rebuild)
+
+    # ---------- truy vấn ----------
+    def _local_edges(self, cell):
+        """Edges from a temporary start/goal cell to its cluster's nodes"""
+        cluster = self.cluster_of(cell)
+        parent = self._cluster_bfs(cell, cluster)
+        return parent, [(v, _depth(parent, v)) for v in self.intra[cluster] if v in parent and v != cell]
+
+    def _refine(self, u, v, local):
+        """Cells after u up to v for one abstract edge"""
+        if v in self.inter.get(u, ()) and self.cluster_of(u) != self.cluster_of(v):
+            return [v]
+        if u in local:
+            return _trace(local[u], v)[1:]
+        if v in local:
+            return list(reversed(_trace(local[v], u)))[1:]
+        cache = self.paths[self.cluster_of(u)]
+        if (u, v) not in cache:
+            cache[(u, v)] = _trace(self._cluster_bfs(u, self.cluster_of(u)), v)[1:]
+        return cache[(u, v)]
+
+    def search(self, start=None, goal=None):
+        """Abstract A* + refinement; returns (path, cost, explored) like astar()"""
+        start = self.maze.start if start is None else start
+        goal = self.maze.goal if goal is None else goal
+        grid = self.maze.maze
+        if grid[start] != 0 or grid[goal] != 0:
+            return None, float("inf"), []
+
+        width = self.width
+        s = start[0] * width + start[1]
+        t = goal[0] * width + goal[1]
+
+        # Cạnh tạm của start/goal tới các node trong cụm của chúng
+        s_parent, s_edges = self._local_edges(s)
+        t_parent, t_edges = self._local_edges(t)
+        local = {s: s_parent, t: t_parent}
+        to_goal = {v: d for v, d in t_edges}
+        if t in s_parent:
+            s_edges.append((t, _depth(s_parent, t)))
+
+        g = {s: 0}
+        came_from = {}
+        closed = set()
+        explored = []
+        open_list = [(heuristic(start, goal), 0, s)]
+
+        while open_list:
+            f, cost, current = heapq.heappop(open_list)
+            if current in closed:
+                continue
+            closed.add(current)
+            explored.append(divmod(current, width))
+            if current == t:
+                break
+
+            if current == s:
+                edges = list(s_edges)
+            else:
+                edges = list(self.intra[self.cluster_of(current)].get(current, ()))
+                if current in to_goal:
+                    edges.append((t, to_goal[current]))
+            edges += [(v, 1) for v in self.inter.get(current, ())]
+
+            for nb, d in edges:
+                new_g = cost + d
+                if new_g < g.get(nb, float("inf")):
+                    g[nb] = new_g
+                    came_from[nb] = current
+                    heapq.heappush(open_list, (new_g + heuristic(divmod(nb, width), goal), new_g, nb))
+
+        if t != s and t not in came_from:
+            return None, float("inf"), explored
+
+        hops = [t]
+        while hops[-1] != s:
+            hops.append(came_from[hops[-1]])
+        hops.reverse()
+
+        path = [s]
+        for u, v in zip(hops, hops[1:]):
+            path.extend(self._refine(u, v, local))
+        return [divmod(cell, width) for cell in path], g[t], explored
+
+
+def _depth(parent, cell):
+    d = 0
+    while parent[cell] is not None:
+        cell = parent[cell]
+        d += 1
+    return d
+
+
+def _trace(parent, cell):
+    """Cells from the BFS source to cell"""
+    out = [cell]
+    while parent[cell] is not None:
+        cell = parent[cell]
+        out.append(cell)
+    return list(reversed(out))
+
+
+_maps = weakref.WeakKeyDictionary()
+
+
+def hierarchical_map(maze, cluster_size=16):
+    """
+    HierarchicalMap of maze. Wall edits made through set_wall() only rebuild
+    the clusters around them (HierarchicalMap.update); any other grid change
+    rebuilds the whole map.
+    """
+    hmap = _maps.get(maze)
+    if hmap is not None and hmap.size == cluster_size and hmap.revision != maze.revision:
+        edits = maze.edits_since(hmap.revision) if hasattr(maze, "edits_since") else None
+        if edits is None:
+            hmap = None
+        else:
+            hmap.update(edits)
+    if hmap is None or hmap.size != cluster_size:
+        hmap = _maps[maze] = HierarchicalMap(maze, cluster_size)
+    return hmap
+
+
+def hierarchical_astar(maze):
+    """HPA* query from maze.start to maze.goal on the cached abstraction"""
+    return hierarchical_map(maze).search()
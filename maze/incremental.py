@@ -0,0 +1,115 @@
+import heapq
+
+INF = float("inf")
+
+
+class IncrementalPlanner:
+    """
+    Lifelong Planning A* (LPA*) between the fixed maze.start and maze.goal.
+    The search state (g, rhs and the open list) is kept between calls, so
+    after a few walls are opened or closed only the part of the
+    shortest-path tree that the change touches is expanded again.
+    """
+
+    def __init__(self, maze):
+        self.maze = maze
+        self.width = width = maze.width
+        self.height = maze.height
+        n = self.height * width
+        self.start = maze.start[0] * width + maze.start[1]
+        self.goal = maze.goal[0] * width + maze.goal[1]
+        self.goal_rc = maze.goal
+
+        self.passable = bytearray((maze.maze == 0).reshape(-1).tobytes())
+        self.g = [INF] * n
+        self.rhs = [INF] * n
+        self.rhs[self.start] = 0
+        self.open_list = [(self._key(self.start), self.start)]
+        self.revision = maze.revision
+
+    def _key(self, s):
+        m = min(self.g[s], self.rhs[s])
+        r, c = divmod(s, self.width)
+        return (m + abs(r - self.goal_rc[0]) + abs(c - self.goal_rc[1]), m)
+
+    def _neighbors(self, s):
+        r, c = divmod(s, self.width)
+        if r > 0:
+            yield s - self.width
+        if r < self.height - 1:
+            yield s + self.width
+        if c > 0:
+            yield s - 1
+        if c < self.width - 1:
+            yield s + 1
+
+    def _update_vertex(self, u):
+        if u != self.start:
+            best = INF
+            if self.passable[u]:
+                for p in self._neighbors(u):
+                    if self.passable[p] and self.g[p] + 1 < best:
+                        best = self.g[p] + 1
+            self.rhs[u] = best
+        if self.g[u] != self.rhs[u]:
+            heapq.heappush(self.open_list, (self._key(u), u))
+
+    def _compute_shortest_path(self):
+        g, rhs, open_list = self.g, self.rhs, self.open_list
+        goal = self.goal
+        expanded = []
+
+        while open_list:
+            k, u = open_list[0]
+            if g[u] == rhs[u] or k != self._key(u):
+                heapq.heappop(open_list)  # bản ghi cũ
+                continue
+            if k >= self._key(goal) and rhs[goal] == g[goal]:
+                break
+
+            heapq.heappop(open_list)
+            expanded.append(divmod(u, self.width))
+            if g[u] > rhs[u]:
+                g[u] = rhs[u]
+                for s in self._neighbors(u):
+                    self._update_vertex(s)
+            else:
+                g[u] = INF
+                self._update_vertex(u)
+                for s in self._neighbors(u):
+                    self._update_vertex(s)
+
+        return expanded
+
+    def _extract_path(self):
+        if self.g[self.goal] == INF:
+            return None
+        path = [self.goal]
+        cur = self.goal
+        while cur != self.start:
+            cur = min((p for p in self._neighbors(cur) if self.passable[p]),
+                      key=lambda p: self.g[p])
+            path.append(cur)
+        return [divmod(s, self.width) for s in reversed(path)]
+
+    def solve(self):
+        """Initial (or pending) search; returns (path, cost, explored)"""
+        return self.update([])
+
+    def update(self, cells):
+        """
+        Re-read the given (row, col) cells from maze.maze after they were
+        opened or closed, repair the search and return (path, cost, explored)
+        where explored lists only the cells expanded by this call.
+        """
+        grid = self.maze.maze
+        for r, c in cells:
+            u = r * self.width + c
+            self.passable[u] = 1 if grid[r, c] == 0 else 0
+            self._update_vertex(u)
+            for s in self._neighbors(u):
+                self._update_vertex(s)
+        self.revision = self.maze.revision
+
+        explored = self._compute_shortest_path()
+        return self._extract_path(), self.g[self.goal], explored
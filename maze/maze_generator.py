@@ -1,19 +1,226 @@
 import random
+import struct
+from array import array
+from itertools import permutations
+
 import numpy as np
 
+# Direction bits of the per-cell neighbor mask, in get_neighbors order
+UP, DOWN, LEFT, RIGHT = 1, 2, 4, 8
+DIRECTIONS = ((UP, -1, 0), (DOWN, 1, 0), (LEFT, 0, -1), (RIGHT, 0, 1))
+
+# NEIGHBOR_OFFSETS[mask] -> (dr, dc) of every open neighbor, Up/Down/Left/Right order
+NEIGHBOR_OFFSETS = tuple(
+    tuple((dr, dc) for bit, dr, dc in DIRECTIONS if mask & bit)
+    for mask in range(16)
+)
+
+# POPCOUNT[mask] -> number of open neighbors
+POPCOUNT = np.array([bin(mask).count("1") for mask in range(16)], dtype=np.uint8)
+
+# All 24 orders of the four lattice moves; the fast DFS draws one per step
+DIRECTION_ORDERS = tuple(permutations(((-1, 0), (1, 0), (0, -1), (0, 1))))
+
+GENERATORS = ("dfs", "dfs_legacy", "kruskal")
+
+# One byte per cell (1 = wall, 0 = open); the direction bits live in neighbor_mask()
+WALL_DTYPE = np.uint8
+
+# On-disk format: fixed 64-byte header, then the raw row-major uint8 grid,
+# so np.memmap can open it at offset HEADER.size without reading it.
+# Bump GENERATOR_VERSION whenever a seed would produce a different maze.
+# Version 2 added the flags byte; version 1 stored "no seed" as seed -1.
+MAZE_MAGIC = b"MAZE"
+FORMAT_VERSION = 2
+GENERATOR_VERSION = 1
+HEADER = struct.Struct("<4sHHIIIIIIq16sB7x")
+HAS_SEED = 1  # bit của flags: trường seed có giá trị
+
+SEED_MIN, SEED_MAX = -2 ** 63, 2 ** 63 - 1  # seed phải vừa int64 của header
+
+
+def check_seed(seed):
+    """seed as a plain int (or None); anything the header cannot store raises"""
+    if seed is None:
+        return None
+    if isinstance(seed, bool) or not isinstance(seed, (int, np.integer)):
+        raise TypeError(f"maze seed must be an int or None, got {type(seed).__name__}")
+    seed = int(seed)
+    if not SEED_MIN <= seed <= SEED_MAX:
+        raise ValueError(f"maze seed {seed} does not fit in a signed 64-bit integer")
+    return seed
+
+
+def pack_header(height, width, start, goal, seed, algorithm):
+    seed = check_seed(seed)
+    flags = 0 if seed is None else HAS_SEED
+    return HEADER.pack(MAZE_MAGIC, FORMAT_VERSION, GENERATOR_VERSION,
+                       height, width, *start, *goal, seed or 0, algorithm.encode(), flags)
+
+
+def read_header(path):
+    """Header of a saved maze file as a dict"""
+    with open(path, "rb") as f:
+        raw = f.read(HEADER.size)
+    if len(raw) < HEADER.size:
+        raise ValueError(f"{path}: file too short for a maze header")
+    (magic, fmt, gen_version, height, width,
+     sr, sc, gr, gc, seed, algorithm, flags) = HEADER.unpack(raw)
+    if magic != MAZE_MAGIC:
+        raise ValueError(f"{path}: not a maze file")
+    if fmt == 1:
+        flags = HAS_SEED if seed >= 0 else 0  # byte đệm của bản 1 luôn là 0
+    elif fmt != FORMAT_VERSION:
+        raise ValueError(f"{path}: unsupported maze format version {fmt}")
+    return {
+        "height": height,
+        "width": width,
+        "start": (sr, sc),
+        "goal": (gr, gc),
+        "seed": seed if flags & HAS_SEED else None,
+        "algorithm": algorithm.rstrip(b"\0").decode(),
+        "generator_version": gen_version,
+    }
+
+
+class DisjointSet:
+    """Union-find over 0..n-1 with path halving and union by size"""
+
+    def __init__(self, n):
+        self.parent = array("i", range(n))
+        self.size = array("i", [1]) * n
+
+    def find(self, x):
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a, b):
+        """Merge the sets of a and b; False if they were already joined"""
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+        if self.size[ra] < self.size[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.size[ra] += self.size[rb]
+        return True
+
+
 class MazeGenerator:
-    def __init__(self, width=21, height=21, complexity=0.25):
+    uniform_cost = True  # every move costs 1; solvers may skip the heap
+    # Mọi thuật toán trong GENERATORS đều khoét cây khung trên lưới ô lẻ
+    # nên start/goal luôn liên thông; lớp con không đảm bảo thì đặt False
+    always_connected = True
+
+    def __init__(self, width=21, height=21, complexity=0.25, algorithm="dfs", seed=None):
         self.width = width if width % 2 == 1 else width + 1  # Ensure odd size
         self.height = height if height % 2 == 1 else height + 1
         self.complexity = complexity  # Controls how many paths are created (0.5-1.0)
-        self.maze = np.ones((self.height, self.width), dtype=int)
+        if algorithm not in GENERATORS:
+            raise ValueError(f"unknown maze algorithm {algorithm!r}, expected one of {GENERATORS}")
+        self.algorithm = algorithm
+        self.source_algorithm = algorithm  # thuật toán đã tạo lưới hiện tại (load() đọc từ file)
+        self.seed = check_seed(seed)
+        self.rng = random.Random(self.seed)
+        # Same seed -> same sequence of mazes: the first grid is carved from
+        # seed itself, each later one from a seed drawn off _seeds
+        self._seeds = random.Random(self.seed)
+        self._next_seed = self.seed
+        self.maze_seed = None          # seed đã khoét lưới hiện tại (xem grid_seed())
+        self._maze_seed_revision = None
+        self.maze = np.ones((self.height, self.width), dtype=WALL_DTYPE)
         self.start = None
         self.goal = None
+        self._neighbor_mask = None  # built lazily by neighbor_mask()
+        self.revision = 0  # bumped on every grid change, for caches built on top
+        self._edits = []   # ô đổi bởi set_wall(), một ô cho mỗi revision từ _edits_base
+        self._edits_base = 0
 
     def generate_maze(self):
         # Initialize maze with walls
-        self.maze = np.ones((self.height, self.width), dtype=int)
+        self.maze = np.ones((self.height, self.width), dtype=WALL_DTYPE)
+        self.invalidate_neighbors()
+        self.source_algorithm = self.algorithm
+        seed = self._next_seed
+        if seed is not None:
+            self.rng = random.Random(seed)
+            self._next_seed = self._seeds.getrandbits(63)
+
+        if self.algorithm == "dfs_legacy":
+            self._carve_dfs_legacy()
+        elif self.algorithm == "kruskal":
+            self._carve_kruskal()
+        else:
+            self._carve_dfs()
+
+        # Add additional paths to reduce dead ends
+        self.add_additional_paths()
+
+        # Set start and goal
+        self.start = (1, 1)  # (row, col)
+        self.goal = (self.height - 2, self.width - 2)  # (row, col)
+        self.set_wall(self.goal[0], self.goal[1], False)  # Ensure goal is open
+
+        # Lưới mới hoàn toàn: bỏ log các ô mở trong lúc sinh
+        self._edits = []
+        self._edits_base = self.revision
+        self.mark_grid_seed(seed)
+
+        return self.maze, self.start, self.goal
+
+    def _carve_dfs(self):
+        """
+        Randomized DFS over the odd-coordinate cell lattice using flat
+        bytearrays, an int array stack and pre-drawn direction orders.
+        Taking the first unvisited move of a random order is the same as
+        random.choice over the unvisited neighbors.
+        """
+        h, w = self.height, self.width
+        ch, cw = (h - 1) // 2, (w - 1) // 2
+        grid = bytearray(b"\x01") * (h * w)
+        if ch == 0 or cw == 0:
+            self.maze = np.ones((h, w), dtype=WALL_DTYPE)
+            return
+
+        # Ô lưới (i, j) <-> k = (i + 1) * w + (j + 1); viền k được đánh dấu sẵn
+        # nên bước đi chỉ là k ± 1, k ± w, không cần kiểm tra biên
+        visited = bytearray(b"\x01") * ((ch + 2) * w)
+        for i in range(1, ch + 1):
+            visited[i * w + 1:i * w + cw + 1] = bytes(cw)
+        orders = [tuple(di * w + dj for di, dj in order) for order in DIRECTION_ORDERS]
+        rng = np.random.default_rng(self.rng.getrandbits(64))
+        draws = rng.integers(0, len(orders), size=2 * ch * cw, dtype=np.uint8).tobytes()
+
+        # Ô (i, j) nằm ở grid[(2i + 1) * w + 2j + 1] = grid[2k - w - 1]
+        shift = w + 1
+        k = w + 1
+        visited[k] = 1
+        grid[2 * k - shift] = 0
+        stack = array("i", [k])
+        t = 0
 
+        while stack:
+            k = stack[-1]
+            for step in orders[draws[t]]:
+                nk = k + step
+                if not visited[nk]:
+                    visited[nk] = 1
+                    cell = 2 * nk - shift
+                    grid[cell] = 0
+                    grid[cell - step] = 0  # tường giữa hai ô
+                    stack.append(nk)
+                    break
+            else:
+                stack.pop()
+            t += 1
+
+        self.maze = np.frombuffer(grid, dtype=WALL_DTYPE).reshape(h, w)
+
+    def _carve_dfs_legacy(self):
+        """Original per-cell DFS, kept as the reference for benchmarks"""
         # Generate maze using randomized DFS from single start
         stack = []
         start_row, start_col = 1, 1
@@ -24,7 +231,7 @@ class MazeGenerator:
             x, y = stack[-1]  # x=row, y=col
             neighbors = self.get_unvisited_neighbors(x, y)
             if neighbors:
-                nx, ny = random.choice(neighbors)  # nx=row, ny=col
+                nx, ny = self.rng.choice(neighbors)  # nx=row, ny=col
                 self.maze[nx, ny] = 0
                 # Remove wall between current and neighbor
                 self.maze[(x + nx) // 2, (y + ny) // 2] = 0
@@ -32,30 +239,101 @@ class MazeGenerator:
             else:
                 stack.pop()
 
-        # Add additional paths to reduce dead ends
-        self.add_additional_paths()
+    def _carve_kruskal(self):
+        """
+        Randomized Kruskal: visit the walls between lattice cells in random
+        order and open each one that joins two different components. The
+        result spans every cell, so start and goal are always connected.
+        """
+        h, w = self.height, self.width
+        ch, cw = (h - 1) // 2, (w - 1) // 2
+        if ch == 0 or cw == 0:
+            return
 
-        # Set start and goal
-        self.start = (1, 1)  # (row, col)
-        self.goal = (self.height - 2, self.width - 2)  # (row, col)
-        self.maze[self.goal[0], self.goal[1]] = 0  # Ensure goal is open
+        i, j = np.divmod(np.arange(ch * cw), cw)
+        right = j < cw - 1
+        down = i < ch - 1
+        # (ô a, ô b, ô tường giữa trong lưới)
+        a = np.concatenate([(i * cw + j)[right], (i * cw + j)[down]])
+        b = np.concatenate([(i * cw + j + 1)[right], (i * cw + j + cw)[down]])
+        walls = np.concatenate([((2 * i + 1) * w + 2 * j + 2)[right],
+                                ((2 * i + 2) * w + 2 * j + 1)[down]])
+        order = np.random.default_rng(self.rng.getrandbits(64)).permutation(len(a))
 
-        return self.maze, self.start, self.goal
+        grid = self.maze.reshape(-1)
+        grid[(2 * i + 1) * w + 2 * j + 1] = 0
+        sets = DisjointSet(ch * cw)
+        remaining = ch * cw - 1
+        for ca, cb, wall in zip(a[order].tolist(), b[order].tolist(), walls[order].tolist()):
+            if sets.union(ca, cb):
+                grid[wall] = 0
+                remaining -= 1
+                if remaining == 0:
+                    break
+
+    def label_components(self):
+        """
+        Connected-component label of every cell (int32, -1 on walls).
+        Vectorized union-find: each round hooks every root onto the smallest
+        neighboring root, then pointer jumping flattens the trees.
+        """
+        h, w = self.height, self.width
+        open_ = (self.maze == 0).reshape(-1)
+        idx = np.arange(h * w, dtype=np.int32)
+
+        horizontal = open_[:-1] & open_[1:] & (idx[:-1] % w != w - 1)
+        vertical = open_[:-w] & open_[w:]
+        eu = np.concatenate([idx[:-1][horizontal], idx[:-w][vertical]])
+        ev = np.concatenate([eu[:horizontal.sum()] + 1, eu[horizontal.sum():] + w])
+
+        parent = idx.copy()
+        while True:
+            pu, pv = parent[eu], parent[ev]
+            differ = pu != pv
+            if not differ.any():
+                break
+            np.minimum.at(parent, np.maximum(pu, pv)[differ], np.minimum(pu, pv)[differ])
+            while True:
+                jumped = parent[parent]
+                if (jumped == parent).all():
+                    break
+                parent = jumped
+
+        return np.where(open_, parent, -1).reshape(h, w).astype(np.int32)
+
+    def is_connected(self, a=None, b=None):
+        """True if cells a and b (default start and goal) are in one open component"""
+        a = self.start if a is None else a
+        b = self.goal if b is None else b
+        labels = self.label_components()
+        return labels[a] >= 0 and labels[a] == labels[b]
+
+    def find_dead_ends(self):
+        """Interior open cells with exactly one open neighbor, in row-major order"""
+        inner = (self.maze[1:-1, 1:-1] == 0) & (POPCOUNT[self.neighbor_mask()[1:-1, 1:-1]] == 1)
+        rows, cols = np.nonzero(inner)
+        return rows + 1, cols + 1
 
     def add_additional_paths(self):
         """Add additional paths to reduce dead ends and create more escape routes"""
         # Find potential dead ends (positions with only one neighbor)
-        dead_ends = []
-        for i in range(1, self.height - 1):
-            for j in range(1, self.width - 1):
-                if self.maze[i, j] == 0:
-                    neighbors = self.get_neighbors((i, j))
-                    if len(neighbors) == 1:  # Dead end
-                        dead_ends.append((i, j))
-
-        # Connect some dead ends to nearby paths
-        for dead_end in dead_ends[:len(dead_ends)//2]:  # Only fix half to keep some challenge
-            self.connect_dead_end(dead_end)
+        rows, cols = self.find_dead_ends()
+        half = len(rows) // 2  # Only fix half to keep some challenge
+
+        # Connect some dead ends to nearby paths, on a flat copy of the grid
+        h, w = self.height, self.width
+        grid = bytearray(self.maze.tobytes())
+        for x, y in zip(rows[:half].tolist(), cols[:half].tolist()):
+            for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+                nx, ny = x + dx, y + dy
+                nnx, nny = nx + dx, ny + dy
+                if (0 < nx < h - 1 and 0 < ny < w - 1 and grid[nx * w + ny] == 1
+                        and 0 <= nnx < h and 0 <= nny < w and grid[nnx * w + nny] == 0):
+                    grid[nx * w + ny] = 0
+                    break
+
+        self.maze[...] = np.frombuffer(grid, dtype=WALL_DTYPE).reshape(h, w)
+        self.invalidate_neighbors()
 
     def connect_dead_end(self, position):
         """Connect a dead end to a nearby path by removing walls"""
@@ -71,7 +349,7 @@ class MazeGenerator:
                 nnx, nny = nx + dx, ny + dy
                 if (0 <= nnx < self.height and 0 <= nny < self.width and 
                     self.maze[nnx, nny] == 0):
-                    self.maze[nx, ny] = 0
+                    self.set_wall(nx, ny, False)
                     break
 
     def get_unvisited_neighbors(self, x, y):
@@ -95,8 +373,69 @@ class MazeGenerator:
             return self.maze[row, col] == 0  # 0 means open space
         return False
 
+    def set_wall(self, row, col, wall=True):
+        """Open or close a single cell and drop the cached neighbor index"""
+        self.maze[row, col] = 1 if wall else 0
+        self._neighbor_mask = None
+        self.revision += 1
+        self._edits.append((row, col))
+
+    def invalidate_neighbors(self):
+        """Forget the neighbor index; call after editing self.maze directly"""
+        self._neighbor_mask = None
+        self.revision += 1
+        # Không biết ô nào đã đổi: edits_since() của revision cũ trả None
+        self._edits = []
+        self._edits_base = self.revision
+
+    def edits_since(self, revision):
+        """
+        (row, col) cells changed by set_wall() after revision, so caches can
+        update locally; None if the grid changed in another way since then.
+        """
+        start = revision - self._edits_base
+        if start < 0 or start > len(self._edits):
+            return None
+        return self._edits[start:]
+
+    def mark_grid_seed(self, seed):
+        """Record that the current grid, as it is now, is rebuilt from seed"""
+        self.maze_seed = seed
+        self._maze_seed_revision = self.revision
+
+    def grid_seed(self):
+        """
+        Seed that rebuilds the current grid (the first maze of a generator
+        with that seed); None if unseeded or edited since it was carved.
+        """
+        if self._maze_seed_revision != self.revision:
+            return None
+        return self.maze_seed
+
+    def neighbor_mask(self):
+        """
+        Per-cell bitmask (uint8, same shape as the maze) of open neighbors,
+        using the UP/DOWN/LEFT/RIGHT bits. Built once per grid with array ops.
+        """
+        if self._neighbor_mask is None:
+            open_ = np.zeros((self.height + 2, self.width + 2), dtype=bool)
+            open_[1:-1, 1:-1] = self.maze == 0
+
+            mask = np.zeros((self.height, self.width), dtype=np.uint8)
+            mask[open_[:-2, 1:-1]] |= UP
+            mask[open_[2:, 1:-1]] |= DOWN
+            mask[open_[1:-1, :-2]] |= LEFT
+            mask[open_[1:-1, 2:]] |= RIGHT
+            self._neighbor_mask = mask
+        return self._neighbor_mask
+
     def get_neighbors(self, position):
         x, y = position
+        if 0 <= x < self.height and 0 <= y < self.width:
+            offsets = NEIGHBOR_OFFSETS[self.neighbor_mask()[x, y]]
+            return [(x + dx, y + dy) for dx, dy in offsets]
+
+        # Outside the grid: fall back to probing each side
         neighbors = []
         directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]  # Up, Down, Left, Right
         for dx, dy in directions:
@@ -105,6 +444,45 @@ class MazeGenerator:
                 neighbors.append((nx, ny))
         return neighbors
 
+    def save(self, path):
+        """Write the header and raw grid; load() memory-maps it back"""
+        if self.start is None or self.goal is None:
+            raise ValueError("save() needs a generated or loaded maze (start/goal not set)")
+        # Dựng header trước khi mở file: lỗi ở đây không được xoá file cũ
+        header = pack_header(self.height, self.width, self.start, self.goal,
+                             self.grid_seed(), self.source_algorithm)
+        with open(path, "wb") as f:
+            f.write(header)
+            np.ascontiguousarray(self.maze, dtype=WALL_DTYPE).tofile(f)
+
+    @classmethod
+    def load(cls, path, mmap_mode="r"):
+        """
+        Open a maze written by save(). With mmap_mode ("r", "r+", "c") the
+        grid is an np.memmap paged in lazily; mmap_mode=None reads it all.
+        """
+        header = read_header(path)
+        height, width = header["height"], header["width"]
+
+        # Dựng với lưới 1x1 để không cấp phát cả lưới rồi mới thay bằng memmap
+        mg = cls(1, 1, seed=header["seed"])
+        mg.width, mg.height = width, height
+        # algorithm là generator dùng cho generate_maze() sau này nên phải thuộc
+        # GENERATORS; tên trong header (vd. "eller") giữ nguyên ở source_algorithm
+        if header["algorithm"] in GENERATORS:
+            mg.algorithm = header["algorithm"]
+        mg.source_algorithm = header["algorithm"]
+        if mmap_mode is None:
+            grid = np.fromfile(path, dtype=WALL_DTYPE, count=height * width, offset=HEADER.size)
+            mg.maze = grid.reshape(height, width)
+        else:
+            mg.maze = np.memmap(path, dtype=WALL_DTYPE, mode=mmap_mode,
+                                offset=HEADER.size, shape=(height, width))
+        mg.start, mg.goal = header["start"], header["goal"]
+        mg.invalidate_neighbors()
+        mg.mark_grid_seed(header["seed"])
+        return mg
+
     def display_maze(self):
         for row in self.maze:
             print(''.join(['#' if cell == 1 else ' ' for cell in row]))
\ No newline at end of file
@@ -0,0 +1,103 @@
+"""
+Publish a maze grid and its neighbor mask once in shared memory so worker
+processes can attach read-only NumPy views instead of unpickling a copy.
+
+    with SharedMaze.publish(mg) as shared:          # tiến trình chính
+        pool.map(work, [shared.descriptor] * n)
+
+    def work(descriptor):                           # tiến trình con
+        mg = attach(descriptor)
+        return dijkstra(mg)
+"""
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from maze.maze_generator import WALL_DTYPE, MazeGenerator
+
+
+class SharedMaze:
+    """
+    Owner side of a published maze. One segment holds the grid followed by
+    the neighbor mask (both uint8, height x width); descriptor is the small
+    picklable dict workers pass to attach().
+    """
+
+    def __init__(self, shm, descriptor):
+        self.shm = shm
+        self.descriptor = descriptor
+
+    @classmethod
+    def publish(cls, mg, name=None):
+        mask = mg.neighbor_mask()
+        cells = mg.height * mg.width
+
+        shm = shared_memory.SharedMemory(name=name, create=True, size=2 * cells)
+        buf = np.ndarray((2, mg.height, mg.width), dtype=WALL_DTYPE, buffer=shm.buf)
+        buf[0] = mg.maze
+        buf[1] = mask
+        del buf  # không giữ export nào trên shm.buf, nếu không close() sẽ lỗi
+
+        descriptor = {
+            "name": shm.name,
+            "height": mg.height,
+            "width": mg.width,
+            "start": tuple(mg.start),
+            "goal": tuple(mg.goal),
+            "seed": mg.seed,
+            "revision": mg.revision,
+        }
+        return cls(shm, descriptor)
+
+    def close(self):
+        """Detach and free the segment; attached workers must be done with it"""
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _open_untracked(name):
+    """
+    Open an existing segment without registering it with the resource
+    tracker: a worker's tracker would otherwise unlink it when the worker
+    exits, under the feet of the owner and the other workers.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        pass
+
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def attach(descriptor):
+    """
+    MazeGenerator whose maze and neighbor mask are read-only views on the
+    shared segment. Solvers use it as is; set_wall() on it raises.
+    """
+    height, width = descriptor["height"], descriptor["width"]
+    shm = _open_untracked(descriptor["name"])
+    views = np.ndarray((2, height, width), dtype=WALL_DTYPE, buffer=shm.buf)
+    views.flags.writeable = False
+
+    # Như MazeGenerator.load(): dựng lưới 1x1 rồi thay bằng view
+    mg = MazeGenerator(1, 1, seed=descriptor["seed"])
+    mg.width, mg.height = width, height
+    mg.maze = views[0]
+    mg._neighbor_mask = views[1]
+    mg.start, mg.goal = descriptor["start"], descriptor["goal"]
+    mg.revision = descriptor["revision"]
+    mg._shm = shm  # view chỉ hợp lệ khi segment còn được giữ
+    return mg
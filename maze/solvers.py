@@ -0,0 +1,78 @@
+import time
+
+from maze.algorithms import (
+    astar, astar_flat, bfs, bidirectional_astar, bidirectional_bfs,
+    dijkstra, dijkstra_flat, dijkstra_heap, jps,
+)
+from maze.contraction import contracted_astar
+from maze.hierarchical import hierarchical_astar
+from maze.incremental import IncrementalPlanner
+from maze.shared import attach
+
+
+def lpa_star(maze):
+    """LPA* from scratch (the incremental planner's first solve)"""
+    return IncrementalPlanner(maze).solve()
+
+
+def prepared_planner(maze):
+    """
+    IncrementalPlanner after its first solve, and the seconds it took. Meant
+    for a worker process: the planner comes back without its maze, so the
+    owner reattaches it with planner.maze = maze before calling update().
+    """
+    t0 = time.perf_counter()
+    planner = IncrementalPlanner(maze)
+    planner.solve()
+    elapsed = time.perf_counter() - t0
+    planner.maze = None
+    return planner, elapsed
+
+
+def prepared_planner_shared(descriptor):
+    """prepared_planner() on a maze published with SharedMaze"""
+    return prepared_planner(attach(descriptor))
+
+
+# Tên -> hàm giải, mọi hàm nhận maze và trả về (path, cost, explored)
+SOLVERS = {
+    "dijkstra": dijkstra,
+    "dijkstra_heap": dijkstra_heap,
+    "dijkstra_flat": dijkstra_flat,
+    "bfs": bfs,
+    "astar": astar,
+    "astar_flat": astar_flat,
+    "bidirectional_bfs": bidirectional_bfs,
+    "bidirectional_astar": bidirectional_astar,
+    "jps": jps,
+    "contracted_astar": contracted_astar,
+    "hpa": hierarchical_astar,
+    "lpa": lpa_star,
+}
+
+# Các hàm nhận stats={} (xem STATS_KEYS trong maze/algorithms.py)
+STATS_SOLVERS = (dijkstra, dijkstra_heap, bfs, astar)
+
+
+def timed_solve(solver, maze, with_stats=False):
+    """
+    Run one solver and time it; returns (path, explored, seconds, stats or
+    None). seconds always times the plain loop: stats come from a second,
+    untimed run of the instrumented one. Module-level so it can be sent to
+    a process pool.
+    """
+    t0 = time.perf_counter()
+    path, cost, explored = solver(maze)
+    elapsed = time.perf_counter() - t0
+
+    stats = None
+    if with_stats and solver in STATS_SOLVERS:
+        stats = {}
+        solver(maze, stats=stats)
+
+    return path, explored, elapsed, stats
+
+
+def timed_solve_shared(solver, descriptor, with_stats=False):
+    """timed_solve() on a maze published with SharedMaze, attached in the worker"""
+    return timed_solve(solver, attach(descriptor), with_stats)